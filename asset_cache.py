@@ -0,0 +1,270 @@
+"""Shared, concurrency-safe cache for the SVGs behind Tex and Text.
+
+manim compiles every Tex expression to media/Tex/<hash>.svg and lays out
+every Text to media/texts/<hash>.svg, checking only whether the file exists.
+Two workers rendering at once can both compile the same hash and one of them
+can read the other's half-written file. Point every worker at one directory
+instead:
+
+    MANIM_ASSET_CACHE=/shared/manim-assets manim -qk manime.py ForwardPropagationDemo
+
+Scenes inheriting SharedAssetScene then build each SVG under a per-key file
+lock in a private staging directory and publish it with an atomic rename plus
+a checksum file, so across a whole render farm every formula and label is
+compiled once. The tool itself prewarms and checks the cache:
+
+    python asset_cache.py prewarm manime.py ForwardPropagationDemo MinibatchDemo
+    python asset_cache.py verify --repair
+    python asset_cache.py stats
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import *
+from manim.utils import tex_file_writing
+
+from scene_base import load_scene_class
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+KINDS = ("Tex", "texts")
+DEFAULT_DIR = os.environ.get("MANIM_ASSET_CACHE", "media/assets")
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def checksum_path(svg):
+    return svg.with_name(svg.name + ".sha256")
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on `path`, shared between processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def config_dir(name, directory):
+    # Point manim's tex_dir / text_dir somewhere else for one build
+    previous = config[name]
+    config[name] = str(directory)
+    try:
+        yield
+    finally:
+        config[name] = previous
+
+
+class AssetCache:
+    def __init__(self, directory):
+        self.directory = Path(directory).resolve()
+        self.hits = 0
+        self.builds = 0
+        self.lock_wait = 0.0
+
+    def path(self, kind, key):
+        return self.directory / kind / f"{key}.svg"
+
+    def ready(self, svg):
+        # The checksum is written last, so its presence means the SVG is complete
+        return checksum_path(svg).exists() and svg.exists()
+
+    def get(self, kind, key, build):
+        """Path of the SVG for `key`; build(staging_dir) runs once across all workers."""
+        svg = self.path(kind, key)
+        if self.ready(svg):
+            self.hits += 1
+            return svg
+        start = time.perf_counter()
+        with file_lock(self.directory / ".locks" / f"{kind}-{key}.lock"):
+            self.lock_wait += time.perf_counter() - start
+            # Another worker may have built it while we waited
+            if self.ready(svg):
+                self.hits += 1
+                return svg
+            svg.parent.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=svg.parent))
+            try:
+                built = Path(build(staging))
+                source = built.with_suffix(".tex")
+                if source.exists():
+                    os.replace(source, svg.with_suffix(".tex"))
+                # Same filesystem, so readers see the whole file or nothing
+                os.replace(built, svg)
+                checksum = checksum_path(svg)
+                tmp = staging / checksum.name
+                tmp.write_text(file_digest(svg))
+                os.replace(tmp, checksum)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            self.builds += 1
+        return svg
+
+    def stats(self):
+        return {"hits": self.hits, "builds": self.builds, "lock_wait": self.lock_wait}
+
+
+# The cache the patched manim functions use, None until install()
+ACTIVE = None
+
+
+def install(directory):
+    """Route manim's Tex compilation and Text layout through a shared cache."""
+    global ACTIVE
+    directory = Path(directory).resolve()
+    if ACTIVE is not None and ACTIVE.directory == directory:
+        return ACTIVE
+    cache = ACTIVE = AssetCache(directory)
+
+    original_tex = getattr(tex_file_writing.tex_to_svg_file, "original", tex_file_writing.tex_to_svg_file)
+
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        template = tex_template or config.tex_template
+        if environment is not None:
+            code = template.get_texcode_for_expression_in_env(expression, environment)
+        else:
+            code = template.get_texcode_for_expression(expression)
+
+        def build(staging):
+            with config_dir("tex_dir", staging):
+                return original_tex(expression, environment, tex_template)
+
+        # Same name manim would give it, so the directory stays usable without this module
+        return ACTIVE.get("Tex", tex_file_writing.tex_hash(code), build)
+
+    tex_to_svg_file.original = original_tex
+    tex_file_writing.tex_to_svg_file = tex_to_svg_file
+    # Tex mobjects hold their own reference to the function
+    from manim.mobject.text import tex_mobject
+    if hasattr(tex_mobject, "tex_to_svg_file"):
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+    original_text = getattr(Text._text2svg, "original", Text._text2svg)
+
+    def _text2svg(self, color=None, *args, **kwargs):
+        def build(staging):
+            with config_dir("text_dir", staging):
+                return original_text(self, color, *args, **kwargs)
+
+        return str(ACTIVE.get("texts", self._text2hash(color), build))
+
+    _text2svg.original = original_text
+    Text._text2svg = _text2svg
+    return cache
+
+
+class SharedAssetScene(Scene):
+    """Use the shared Tex/Text cache named by MANIM_ASSET_CACHE, if set."""
+
+    def setup(self):
+        super().setup()
+        directory = os.environ.get("MANIM_ASSET_CACHE")
+        self.asset_cache = install(directory) if directory else None
+
+    def tear_down(self):
+        super().tear_down()
+        if self.asset_cache is not None:
+            logger.info(
+                "Asset cache: %(hits)d hits, %(builds)d built, %(lock_wait).2fs waiting for locks",
+                self.asset_cache.stats(),
+            )
+
+
+def prewarm(directory, file, scenes):
+    """Build every Tex/Text the scenes use, without rendering a frame."""
+    os.environ["MANIM_ASSET_CACHE"] = str(directory)
+    cache = install(directory)
+    for name in scenes:
+        scene_class = load_scene_class(file, name)
+        with tempconfig({"dry_run": True}):
+            scene_class(skip_animations=True).render()
+        print(f"{name}: {cache.builds} built, {cache.hits} already cached so far")
+    return cache
+
+
+def verify(directory, repair=False):
+    """Return [(path, problem)] for every asset that is incomplete or corrupt."""
+    directory = Path(directory)
+    problems = []
+    for kind in KINDS:
+        for svg in sorted((directory / kind).glob("*.svg")):
+            checksum = checksum_path(svg)
+            if not checksum.exists():
+                problem = "no checksum"
+            elif checksum.read_text().strip() != file_digest(svg):
+                problem = "checksum mismatch"
+            else:
+                try:
+                    ET.parse(svg)
+                    problem = None
+                except ET.ParseError as e:
+                    problem = f"invalid SVG ({e})"
+            if problem:
+                problems.append((svg, problem))
+                if repair:
+                    svg.unlink()
+                    checksum.unlink(missing_ok=True)
+        # Leftovers of builds that were killed halfway
+        for staging in (directory / kind).glob(".staging-*"):
+            problems.append((staging, "stale staging directory"))
+            if repair:
+                shutil.rmtree(staging, ignore_errors=True)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared Tex/Text asset cache.")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="cache directory (default: $MANIM_ASSET_CACHE or media/assets)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("prewarm", help="compile everything the given scenes use")
+    warm.add_argument("file")
+    warm.add_argument("scenes", nargs="+")
+    check = sub.add_parser("verify", help="check every asset against its checksum")
+    check.add_argument("--repair", action="store_true", help="delete broken assets so they are rebuilt")
+    sub.add_parser("stats", help="number and size of cached assets")
+    args = parser.parse_args(argv)
+
+    if args.command == "prewarm":
+        cache = prewarm(args.dir, args.file, args.scenes)
+        print(f"{cache.builds} assets built, {cache.hits} reused, in {cache.directory}")
+    elif args.command == "verify":
+        problems = verify(args.dir, args.repair)
+        for path, problem in problems:
+            print(f"{path}: {problem}")
+        print(f"{len(problems)} problems" + (" repaired" if args.repair and problems else ""))
+        return 1 if problems and not args.repair else 0
+    else:
+        for kind in KINDS:
+            files = list((Path(args.dir) / kind).glob("*.svg"))
+            size = sum(f.stat().st_size for f in files)
+            print(f"{kind:6s} {len(files):6d} assets {size / 1024:10.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Render one scene for many network specs (input vectors, weight sets) in one job.
+
+Variants come from a JSON list or a CSV file. Every entry may set any
+NetworkSpec field (layer_sizes, weights, biases, inputs, activation,
+decimals); missing fields fall back to the scene's own spec, plus an
+optional "name" used for the output file:
+
+    [{"name": "student_a", "inputs": [0.1, 0.9, 0.4]},
+     {"name": "student_b", "inputs": [0.7, 0.2, 0.3], "activation": "tanh"}]
+
+In a CSV, list-valued cells are JSON ("[0.1, 0.9, 0.4]") or space separated
+numbers ("0.1 0.9 0.4").
+
+    python batch_render.py manime.py ForwardPropagationDemo variants.json -q l -j 4
+
+Variants are rendered in-process by a pool of long-lived workers, so the
+label and plot caches stay warm from one variant to the next, and all
+workers share the on-disk Text/Tex and plot caches under the media dir. A
+manifest with the output path and timing of every variant is written next
+to the videos.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from manim import config, tempconfig
+
+from caching import LABELS, PLOTS
+from network import NetworkSpec
+from parallel_render import QUALITY_FLAGS, video_dir
+from scene_base import load_scene_class
+
+LIST_FIELDS = {"layer_sizes", "weights", "biases", "inputs"}
+
+
+def parse_cell(field, value):
+    value = value.strip()
+    if field in LIST_FIELDS:
+        if value.startswith("["):
+            return json.loads(value)
+        return [float(v) for v in re.split(r"[\s;]+", value) if v]
+    if field == "decimals":
+        return int(value) if value else None
+    return value
+
+
+def load_variants(path):
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [
+                {field: parse_cell(field, value) for field, value in row.items() if field and value}
+                for row in csv.DictReader(f)
+            ]
+    else:
+        rows = json.loads(path.read_text(encoding="utf-8"))
+    for i, row in enumerate(rows):
+        row.setdefault("name", f"variant{i:03d}")
+    return rows
+
+
+def variant_spec(base, row):
+    data = base.to_dict()
+    data.update({k: v for k, v in row.items() if k != "name"})
+    return NetworkSpec.from_dict(data)
+
+
+# Worker state: the scene module is imported once per worker process
+_scene_class = None
+_scene_file = None
+
+
+def _init_worker(file, scene):
+    global _scene_class, _scene_file
+    _scene_class = load_scene_class(file, scene)
+    _scene_file = str(Path(file).resolve())
+
+
+def _render_variant(row, quality, media_dir):
+    name = re.sub(r"\W+", "_", row["name"])
+    spec = variant_spec(_scene_class.spec, row)
+    hits, misses = LABELS.hits, LABELS.misses
+    start = time.perf_counter()
+    # input_file puts outputs under videos/<module>/<quality>, like the CLI
+    config_overrides = {
+        "quality": QUALITY_FLAGS[quality], "media_dir": media_dir, "output_file": name, "input_file": _scene_file,
+    }
+    with tempconfig(config_overrides):
+        # A subclass per variant gives each its own partial movie directory
+        scene = type(name, (_scene_class,), {"spec": spec})()
+        scene.render()
+        output = str(scene.renderer.file_writer.movie_file_path)
+    return {
+        "name": row["name"],
+        "output": output,
+        "seconds": round(time.perf_counter() - start, 3),
+        "worker": os.getpid(),
+        "label_cache": {"hits": LABELS.hits - hits, "misses": LABELS.misses - misses},
+        "plot_cache": PLOTS.stats(),
+        "spec": spec.to_dict(),
+    }
+
+
+def batch_render(file, scene, variants, quality="l", jobs=None, media_dir="media", manifest=None):
+    file = Path(file)
+    rows = load_variants(variants)
+    # Validate every variant up front rather than failing halfway through the job
+    base = load_scene_class(file, scene).spec
+    for row in rows:
+        variant_spec(base, row)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(str(file), scene),
+    ) as pool:
+        futures = [pool.submit(_render_variant, row, quality, media_dir) for row in rows]
+        results = []
+        for future in futures:
+            result = future.result()
+            print(f"{result['name']}: {result['seconds']:.1f}s -> {result['output']}")
+            results.append(result)
+    total = time.perf_counter() - start
+
+    manifest = Path(manifest or video_dir(media_dir, file.stem, quality) / f"{scene}_batch.json")
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(json.dumps({
+        "scene": scene,
+        "quality": quality,
+        "variants": len(results),
+        "wall_seconds": round(total, 3),
+        "render_seconds": round(sum(r["seconds"] for r in results), 3),
+        "results": results,
+    }, indent=1))
+    print(f"{len(results)} variants in {total:.1f}s, manifest at {manifest}")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a scene once per parameter set.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("variants", help="JSON list or CSV of NetworkSpec fields")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--media_dir", default=config.media_dir)
+    parser.add_argument("--manifest", help="where to write the manifest")
+    args = parser.parse_args(argv)
+    batch_render(args.file, args.scene, args.variants, args.quality, args.jobs, args.media_dir, args.manifest)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Headless benchmarks for the forward-propagation scene.
+
+Every case runs in a fresh process, twice: once with animations skipped to
+time scene construction, and once rasterizing every frame with movie
+writing turned off, so ffmpeg never runs. Cases cover the scene as shipped
+and generated networks of growing width and depth; a few micro-benchmarks
+time the layout, edge and label helpers on their own.
+
+    python bench.py -o bench.json
+    python bench.py --compare bench.json --tolerance 0.2
+
+With --compare the run fails (exit status 1) when a metric is worse than the
+baseline by more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import manim
+import numpy as np
+from manim import tempconfig
+
+from caching import LABELS, PLOTS
+from network import (
+    NetworkSpec,
+    edge_endpoints,
+    edge_label_anchors,
+    grid_to_screen,
+    layer_positions,
+    layout_edge_labels,
+)
+from parallel_render import QUALITY_FLAGS
+from profiling import peak_rss, written_frames
+from scene_base import load_scene_class
+
+# name -> layer sizes (None is the scene's own spec)
+CASES = {
+    "default": None,
+    "width-8": [8, 8, 1],
+    "width-16": [16, 16, 1],
+    "width-32": [32, 32, 1],
+    "depth-4": [8, 8, 8, 1],
+    "depth-6": [8, 8, 8, 8, 8, 1],
+    "8-16-16-4": [8, 16, 16, 4],
+}
+# Lower is better for all of them
+METRICS = ["build_seconds", "render_seconds", "ms_per_frame", "peak_rss_mb"]
+
+
+def case_scene(file, scene, sizes):
+    scene_class = load_scene_class(file, scene)
+    if sizes is None:
+        return scene_class
+    return type(scene_class.__name__, (scene_class,), {"spec": NetworkSpec.random(sizes)})
+
+
+def run_case(file, scene, sizes, quality):
+    scene_class = case_scene(file, scene, sizes)
+
+    LABELS.clear()
+    PLOTS.clear()
+    with tempconfig({"quality": QUALITY_FLAGS[quality], "dry_run": True}):
+        start = time.perf_counter()
+        scene_class(skip_animations=True).render()
+        build = time.perf_counter() - start
+
+    LABELS.clear()
+    PLOTS.clear()
+    frames = 0
+    with tempconfig({"quality": QUALITY_FLAGS[quality], "write_to_movie": False,
+                     "save_last_frame": False, "disable_caching": True}):
+        instance = scene_class()
+        write_frame = instance.renderer.file_writer.write_frame
+
+        def counting_write_frame(*args, **kwargs):
+            nonlocal frames
+            frames += written_frames(args, kwargs)
+            write_frame(*args, **kwargs)
+
+        instance.renderer.file_writer.write_frame = counting_write_frame
+        start = time.perf_counter()
+        instance.render()
+        render = time.perf_counter() - start
+
+    rss = peak_rss()
+    return {
+        "build_seconds": round(build, 4),
+        "render_seconds": round(render, 4),
+        "frames": frames,
+        "ms_per_frame": round(1000 * render / frames, 3) if frames else None,
+        "peak_rss_mb": None if rss is None else round(rss / 2**20, 1),
+        "plays": instance.renderer.num_plays,
+    }
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def micro_benchmarks():
+    from mobjects import EdgeBundle
+
+    results = {}
+    for n in [16, 128, 512]:
+        src, dst = (grid_to_screen(p) for p in layer_positions([n, n])[:2])
+        starts, ends = edge_endpoints(src, dst)
+        weights = NetworkSpec.random([n, n]).weights[0].T
+        results[f"layout-{n}x{n}_ms"] = timed(lambda: edge_label_anchors(*edge_endpoints(src, dst)))
+        results[f"edge-bundle-{n}x{n}_ms"] = timed(lambda: EdgeBundle(starts, ends, weights))
+    # Weight labels: from the 256 edges of a small network up to the 1024+
+    # edge layers that made per-label layout slow
+    for n in [16, 32, 48]:
+        src, dst = (grid_to_screen(p) for p in layer_positions([n, n])[:2])
+        starts, ends = edge_endpoints(src, dst)
+        sizes = np.tile([1.0, 0.22], (len(starts), 1))
+        results[f"label-layout-{n}x{n}_ms"] = timed(lambda: layout_edge_labels(starts, ends, sizes), repeat=3)
+    labels = [f"{w:.1f}" for w in range(200)]
+    LABELS.clear()
+    results["labels-200-cold_ms"] = timed(lambda: [LABELS.text(s, font_size=16) for s in labels], repeat=1)
+    results["labels-200-warm_ms"] = timed(lambda: [LABELS.text(s, font_size=16) for s in labels])
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions as human readable strings."""
+    regressions = []
+    for case, metrics in results["cases"].items():
+        old = baseline.get("cases", {}).get(case)
+        if old is None:
+            continue
+        for metric in METRICS:
+            new_value, old_value = metrics.get(metric), old.get(metric)
+            if new_value is None or not old_value:
+                continue
+            if new_value > old_value * (1 + tolerance):
+                regressions.append(f"{case} {metric}: {old_value} -> {new_value} "
+                                   f"(+{new_value / old_value - 1:.0%})")
+    for name, new_value in results.get("micro", {}).items():
+        old_value = baseline.get("micro", {}).get(name)
+        if old_value and new_value > old_value * (1 + tolerance):
+            regressions.append(f"{name}: {old_value} -> {new_value} (+{new_value / old_value - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scene construction and frame rendering.")
+    parser.add_argument("--file", default="manime.py")
+    parser.add_argument("--scene", default="ForwardPropagationDemo")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--no-micro", action="store_true", help="skip the micro-benchmarks")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to check against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    results = {
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "manim": manim.__version__,
+            "quality": args.quality,
+        },
+        "cases": {},
+    }
+    for case in args.cases:
+        # A fresh process per case keeps peak memory and caches independent
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            result = pool.submit(run_case, args.file, args.scene, CASES[case], args.quality).result()
+        results["cases"][case] = result
+        print(f"{case:>10}: build {result['build_seconds']:.2f}s, render {result['render_seconds']:.2f}s, "
+              f"{result['frames']} frames ({result['ms_per_frame']} ms/frame), peak {result['peak_rss_mb']} MB")
+    if not args.no_micro:
+        results["micro"] = micro_benchmarks()
+        for name, ms in results["micro"].items():
+            print(f"{name:>24}: {ms} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from manim import *
+import numpy as np
+
+from mobjects import POOL
+
+
+class LabelCache:
+    """Bounded LRU cache of laid-out Text mobjects.
+
+    Building a Text runs Pango layout and parses the resulting SVG; the same
+    (string, color, font_size) triple shows up many times in a scene. The
+    first request builds a prototype, every request gets a copy of it (or a
+    released copy reset from the mobject pool), so callers are free to move,
+    scale and recolor what they get back.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def text(self, text, **kwargs):
+        key = (text, tuple(sorted((name, repr(value)) for name, value in kwargs.items())))
+        prototype = self._cache.get(key)
+        if prototype is None:
+            self.misses += 1
+            prototype = Text(text, **kwargs)
+            self._cache[key] = prototype
+            if len(self._cache) > self.maxsize:
+                evicted, _ = self._cache.popitem(last=False)
+                POOL.discard(("text", evicted))
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return POOL.acquire(("text", key), prototype)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+# Shared by every scene in the process
+LABELS = LabelCache()
+
+
+def cached_text(text, **kwargs):
+    """Drop-in replacement for Text(...) backed by the shared LabelCache."""
+    return LABELS.text(text, **kwargs)
+
+
+def function_key(fn):
+    # Name plus bytecode and constants, so editing a function (or a lambda)
+    # invalidates whatever was cached for it
+    code = getattr(fn, "__code__", None)
+    body = (code.co_code.hex(), repr(code.co_consts)) if code is not None else ()
+    return (getattr(fn, "__module__", None), getattr(fn, "__qualname__", repr(fn)), body)
+
+
+class CachedAxes(VGroup):
+    """Axes rebuilt from cached point arrays.
+
+    Behaves like the Axes it was captured from for drawing and for c2p. The
+    coordinate mapping is kept in an invisible reference path holding
+    c2p(x0, y0), c2p(x1, y0) and c2p(x0, y1), so it follows the axes when
+    they are moved or scaled.
+    """
+
+    def __init__(self, data, **kwargs):
+        super().__init__(**kwargs)
+        bounds = np.cumsum(data["axes_counts"])[:-1]
+        for points, stroke, width, fill in zip(
+            np.split(data["axes_points"], bounds),
+            data["stroke_rgbas"],
+            data["stroke_widths"],
+            data["fill_rgbas"],
+        ):
+            part = VMobject()
+            part.set_points(points)
+            part.set_stroke(color=rgb_to_color(stroke[:3]), width=width, opacity=stroke[3])
+            part.set_fill(color=rgb_to_color(fill[:3]), opacity=fill[3])
+            self.add(part)
+
+        reference = data["reference"]
+        self.reference = VMobject(stroke_width=0, fill_opacity=0)
+        self.reference.set_points(np.vstack([reference, reference[:1]]))
+        self.add(self.reference)
+        self.x0, self.x1, self.y0, self.y1 = data["ranges"]
+
+    def coords_to_point(self, x, y):
+        origin, x_end, y_end = self.reference.points[:3]
+        return (
+            origin
+            + (x - self.x0) / (self.x1 - self.x0) * (x_end - origin)
+            + (y - self.y0) / (self.y1 - self.y0) * (y_end - origin)
+        )
+
+    c2p = coords_to_point
+
+
+class PlotCache:
+    """Axes + graph geometry cached in memory and on disk.
+
+    Keyed by the axes ranges, lengths and style, the plotted function and the
+    sampling, so re-running a render (or showing the same activation twice)
+    skips building ticks and sampling the curve. Only linear axes are
+    supported; the function has to accept NumPy arrays.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = {}
+
+    def path(self):
+        return Path(self.directory or Path(config.media_dir) / "plots")
+
+    def axes_with_graph(self, fn, x_range, y_range, x_length, y_length,
+                        axis_config=None, graph_color=WHITE, samples=None):
+        if samples is None:
+            # Same density as Axes.plot: ten samples per x tick
+            samples = int(round((x_range[1] - x_range[0]) / x_range[2] * 10)) + 1
+        key = hashlib.sha256(repr((
+            function_key(fn), list(x_range), list(y_range), x_length, y_length,
+            sorted((axis_config or {}).items()), str(graph_color), samples,
+        )).encode()).hexdigest()[:16]
+
+        data = self._memory.get(key)
+        if data is not None:
+            self.hits += 1
+        else:
+            file = self.path() / f"{key}.npz"
+            if file.exists():
+                self.disk_hits += 1
+                with np.load(file) as archive:
+                    data = dict(archive)
+            else:
+                self.misses += 1
+                data = self._compute(fn, x_range, y_range, x_length, y_length, axis_config, samples)
+                self._save(file, data)
+            self._memory[key] = data
+
+        axes = CachedAxes(data)
+        graph = VMobject(stroke_color=graph_color)
+        graph.set_points(data["graph_points"])
+        return axes, graph
+
+    def _compute(self, fn, x_range, y_range, x_length, y_length, axis_config, samples):
+        axes = Axes(
+            x_range=x_range,
+            y_range=y_range,
+            x_length=x_length,
+            y_length=y_length,
+            axis_config=axis_config or {},
+        )
+        members = axes.family_members_with_points()
+        x0, x1 = x_range[:2]
+        y0, y1 = y_range[:2]
+        reference = np.array([axes.c2p(x0, y0), axes.c2p(x1, y0), axes.c2p(x0, y1)])
+
+        # Sample the whole grid in one call and map it through the (linear) axes
+        xs = np.linspace(x0, x1, samples)
+        ys = np.asarray(fn(xs), dtype=float)
+        keep = np.isfinite(ys)
+        xs, ys = xs[keep], ys[keep]
+        origin, x_end, y_end = reference
+        points = (
+            origin
+            + np.outer((xs - x0) / (x1 - x0), x_end - origin)
+            + np.outer((ys - y0) / (y1 - y0), y_end - origin)
+        )
+        graph = VMobject()
+        graph.set_points_smoothly(points)
+
+        return {
+            "axes_points": np.concatenate([m.points for m in members]),
+            "axes_counts": np.array([len(m.points) for m in members]),
+            "stroke_rgbas": np.array([m.get_stroke_rgbas()[0] for m in members]),
+            "stroke_widths": np.array([m.get_stroke_width() for m in members]),
+            "fill_rgbas": np.array([m.get_fill_rgbas()[0] for m in members]),
+            "reference": reference,
+            "ranges": np.array([x0, x1, y0, y1], dtype=float),
+            "graph_points": graph.points,
+        }
+
+    def _save(self, file, data):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary name first so a crashed render never leaves a
+        # truncated archive behind
+        tmp = file.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez(tmp, **data)
+        os.replace(tmp, file)
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def clear(self):
+        # Only the in-memory copies, the files on disk stay
+        self._memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+
+PLOTS = PlotCache()
@@ -0,0 +1,163 @@
+"""Checkpoints at section boundaries and resuming a failed render.
+
+Scenes built on CheckpointScene pickle their state before every timeline
+segment: the mobjects on screen, the camera, the attributes named in
+checkpoint_attributes and the partial movies of the segments already done.
+If a long render dies late, resume it instead of starting over:
+
+    python checkpoint.py manime.py ForwardPropagationDemo -q k --resume
+
+(or MANIM_RESUME=1 manim -qk manime.py ForwardPropagationDemo). The
+checkpoint is restored and construct() continues at the first unfinished
+segment; earlier segments are neither run nor rendered, their movies are
+reused as they are. A checkpoint only applies to the same timeline, network,
+code and resolution, otherwise the render starts from the top.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+from manim import *
+
+from parallel_render import QUALITY_FLAGS
+from timeline import TimelineScene, code_hash
+
+CAMERA_ATTRIBUTES = ("frame_center", "frame_width", "frame_height", "background_color", "background_opacity")
+
+
+class CheckpointScene(TimelineScene):
+    """Timeline scene that checkpoints before every segment and can resume."""
+
+    # Scene attributes later steps depend on, saved with the mobjects
+    checkpoint_attributes = ()
+    checkpoints = True
+
+    def setup(self):
+        super().setup()
+        self.checkpoint_path = None
+        self.resumed_from = None
+        movie = getattr(self.renderer.file_writer, "movie_file_path", None)
+        if self.checkpoints and movie is not None:
+            self.checkpoint_path = Path(movie).parent / "checkpoints" / f"{Path(movie).stem}.pkl"
+
+    def checkpoint_key(self, timeline):
+        camera = self.renderer.camera
+        digest = hashlib.sha256(json.dumps(timeline, sort_keys=True).encode())
+        digest.update(code_hash(inspect.getfile(type(self))).encode())
+        digest.update(pickle.dumps(getattr(self, "spec", None)))
+        digest.update(repr((camera.pixel_width, camera.pixel_height, camera.frame_rate)).encode())
+        return digest.hexdigest()
+
+    def run_timeline(self, timeline):
+        key = self.checkpoint_key(timeline) if self.checkpoint_path else None
+        start = 0
+        if key and os.environ.get("MANIM_RESUME"):
+            start = self.load_checkpoint(key) or 0
+        for i, segment in enumerate(timeline["segments"]):
+            if i < start:
+                continue
+            if key and i > start:
+                self.save_checkpoint(key, i)
+            self.section(segment["title"])
+            getattr(self, segment["step"])(**segment.get("params", {}))
+
+    def save_checkpoint(self, key, next_segment):
+        renderer = self.renderer
+        writer = renderer.file_writer
+        camera = renderer.camera
+        try:
+            state = {
+                "key": key,
+                "next": next_segment,
+                # One pickle for everything keeps shared references shared
+                "mobjects": self.mobjects,
+                "foreground_mobjects": self.foreground_mobjects,
+                "attributes": {name: getattr(self, name) for name in self.checkpoint_attributes if hasattr(self, name)},
+                "camera": {name: getattr(camera, name) for name in CAMERA_ATTRIBUTES if hasattr(camera, name)},
+                "num_plays": renderer.num_plays,
+                "time": renderer.time,
+                "animations_hashes": list(renderer.animations_hashes),
+                "partial_movie_files": list(writer.partial_movie_files),
+                "sections": [
+                    # manim 0.18 calls the field `type`, 0.19 `type_`
+                    (s.name, getattr(s, "type_", getattr(s, "type", None)), s.skip_animations,
+                     list(s.partial_movie_files))
+                    for s in writer.sections
+                ],
+                "section_starts": list(self.section_starts),
+            }
+            data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning("Checkpoint skipped, scene state can't be saved: %s", e)
+            return
+        path = self.checkpoint_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def load_checkpoint(self, key):
+        """Restore the saved state and return the segment to continue from."""
+        path = self.checkpoint_path
+        if not path.exists():
+            logger.info("No checkpoint at %s, rendering from the start", path)
+            return None
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state["key"] != key:
+            logger.warning("Checkpoint %s is for another timeline, network or code, rendering from the start", path)
+            return None
+        missing = [movie for movie in state["partial_movie_files"] if movie and not os.path.exists(movie)]
+        if missing:
+            logger.warning("%d partial movies of the checkpoint are gone, rendering from the start", len(missing))
+            return None
+
+        self.mobjects = state["mobjects"]
+        self.foreground_mobjects = state["foreground_mobjects"]
+        for name, value in state["attributes"].items():
+            setattr(self, name, value)
+        renderer = self.renderer
+        for name, value in state["camera"].items():
+            setattr(renderer.camera, name, value)
+        renderer.num_plays = state["num_plays"]
+        renderer.time = state["time"]
+        renderer.animations_hashes = state["animations_hashes"]
+        writer = renderer.file_writer
+        writer.sections = []
+        for name, type_, skip_animations, movies in state["sections"]:
+            writer.next_section(name, type_ or DefaultSectionType.NORMAL, skip_animations)
+            writer.sections[-1].partial_movie_files = movies
+        # Newer manim derives the flat list from the sections
+        if not isinstance(getattr(type(writer), "partial_movie_files", None), property):
+            writer.partial_movie_files = state["partial_movie_files"]
+        self.section_starts = state["section_starts"]
+        self.resumed_from = state["next"]
+        logger.info("Resumed from checkpoint before segment %d (%d plays done)", state["next"], state["num_plays"])
+        return state["next"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a scene with manim, optionally resuming from its last checkpoint.",
+        epilog="Other arguments are passed on to manim.",
+    )
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    args, manim_args = parser.parse_known_args(argv)
+    env = dict(os.environ)
+    if args.resume:
+        env["MANIM_RESUME"] = "1"
+    command = [sys.executable, "-m", "manim", "render", f"-q{args.quality}", *manim_args, args.file, args.scene]
+    return subprocess.call(command, env=env)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Keep manim warm and re-render a scene whenever its sources change.
+
+    python daemon.py manime.py ForwardPropagationDemo -q l -p
+
+A cold `manim -pql ...` pays for importing manim (Cairo, Pango, NumPy, the
+mobject library) and font discovery before construct() even starts. The
+daemon pays that once, then watches the scene's directory: when a module
+changes, only that module and the sibling modules importing it are
+re-imported, so manim and the label/plot caches in the untouched helper
+modules stay warm. Each render goes through manim's partial movie cache, so
+only plays whose content changed are encoded again; the report lists, per
+section, how many plays were re-rendered and times the reload and the render
+separately from the one-off startup.
+"""
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+import traceback
+from pathlib import Path
+
+from manim import *
+from manim.utils.file_ops import open_file
+
+IMPORT_SECONDS = time.perf_counter() - STARTED
+
+from parallel_render import QUALITY_FLAGS
+from scene_base import imported_names, load_scene_class
+
+
+def affected_modules(directory, changed):
+    """The changed modules plus every sibling module that imports them, directly or not."""
+    modules = {path.stem: path for path in Path(directory).glob("*.py")}
+    imports = {}
+    for name, path in modules.items():
+        try:
+            imports[name] = imported_names(path) & modules.keys()
+        except SyntaxError:
+            imports[name] = set()
+    affected = set(changed)
+    while True:
+        new = {name for name, deps in imports.items() if deps & affected} - affected
+        if not new:
+            return affected
+        affected |= new
+
+
+def section_report(scene, cached):
+    """[(section, plays, re-rendered)] from the play hashes of a finished render."""
+    hashes = scene.renderer.animations_hashes
+    extension = config.movie_file_extension
+    starts = list(getattr(scene, "section_starts", [])) or [("Scene", 0)]
+    if starts[0][1] > 0:
+        starts.insert(0, ("Start", 0))
+    bounds = [start for _, start in starts[1:]] + [len(hashes)]
+    report = []
+    for (name, start), end in zip(starts, bounds):
+        section = [h for h in hashes[start:end] if h is not None]
+        if section:
+            report.append((name, len(section), sum(f"{h}{extension}" not in cached for h in section)))
+    return report
+
+
+class RenderDaemon:
+    def __init__(self, file, scenes, quality="l", preview=False, watch=()):
+        self.file = Path(file).resolve()
+        self.directory = self.file.parent
+        self.scenes = scenes
+        self.quality = quality
+        self.preview = preview
+        self.extra = [Path(p).resolve() for p in watch]
+        if os.environ.get("MANIM_TIMELINE"):
+            self.extra.append(Path(os.environ["MANIM_TIMELINE"]).resolve())
+        self.mtimes = self.snapshot()
+
+    def snapshot(self):
+        paths = list(self.directory.glob("*.py")) + [p for p in self.extra if p.exists()]
+        return {path: path.stat().st_mtime for path in paths}
+
+    def warm_up(self):
+        start = time.perf_counter()
+        # Font discovery happens on the first Text otherwise
+        try:
+            import manimpango
+            manimpango.list_fonts()
+        except ImportError:
+            pass
+        for name in self.scenes:
+            load_scene_class(self.file, name)
+        return time.perf_counter() - start
+
+    def reload(self, changed):
+        start = time.perf_counter()
+        modules = {path.stem for path in changed if path.suffix == ".py" and path.parent == self.directory}
+        affected = affected_modules(self.directory, modules)
+        for name in affected:
+            sys.modules.pop(name, None)
+        return sorted(affected), time.perf_counter() - start
+
+    def render(self, name):
+        start = time.perf_counter()
+        # input_file puts partials under videos/<module>/<quality>, shared with CLI renders
+        with tempconfig({"quality": QUALITY_FLAGS[self.quality], "input_file": str(self.file)}):
+            scene = load_scene_class(self.file, name)()
+            writer = scene.renderer.file_writer
+            directory = getattr(writer, "partial_movie_directory", None)
+            cached = set(os.listdir(directory)) if directory and os.path.isdir(directory) else set()
+            scene.render()
+            movie = getattr(writer, "movie_file_path", None)
+        seconds = time.perf_counter() - start
+
+        report = section_report(scene, cached)
+        plays = sum(n for _, n, _ in report)
+        rendered = sum(r for _, _, r in report)
+        print(f"{name}: {rendered} of {plays} plays re-rendered in {seconds:.2f}s -> {movie}")
+        for section, n, r in report:
+            if r:
+                print(f"  {section}: {r}/{n} re-rendered")
+        if self.preview and movie is not None:
+            open_file(movie)
+
+    def render_all(self):
+        for name in self.scenes:
+            try:
+                self.render(name)
+            except Exception:
+                # Keep watching; the next save probably fixes it
+                traceback.print_exc()
+
+    def changes(self):
+        snapshot = self.snapshot()
+        changed = [p for p in snapshot.keys() | self.mtimes.keys() if snapshot.get(p) != self.mtimes.get(p)]
+        self.mtimes = snapshot
+        return changed
+
+    def run(self, interval=0.5):
+        warm = self.warm_up()
+        print(f"startup: imports {IMPORT_SECONDS:.2f}s, warm-up {warm:.2f}s (paid once)")
+        self.render_all()
+        print(f"watching {self.directory} (Ctrl+C to stop)")
+        while True:
+            time.sleep(interval)
+            changed = self.changes()
+            if not changed:
+                continue
+            # Editors often write in several steps; wait for things to settle
+            time.sleep(interval)
+            changed += self.changes()
+            detected = time.perf_counter()
+            modules, seconds = self.reload(changed)
+            names = ", ".join(sorted({p.name for p in changed}))
+            print(f"\n{time.strftime('%H:%M:%S')} {names} changed, reloaded {', '.join(modules) or 'nothing'} "
+                  f"in {seconds:.2f}s")
+            self.render_all()
+            print(f"edit to video in {time.perf_counter() - detected:.2f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-render scenes on every change, with manim kept warm.")
+    parser.add_argument("file")
+    parser.add_argument("scenes", nargs="+")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("-p", "--preview", action="store_true", help="open the movie after every render")
+    parser.add_argument("--watch", nargs="*", default=(), help="extra files to watch (timelines, data)")
+    parser.add_argument("--interval", type=float, default=0.5, help="polling interval in seconds")
+    args = parser.parse_args(argv)
+    try:
+        RenderDaemon(args.file, args.scenes, args.quality, args.preview, args.watch).run(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Keyframe snapshots and golden-frame regression checks.
+
+Instead of rendering and watching the whole video, run the scene with every
+animation skipped and rasterize only a few frames at low resolution: the end
+state of every play() and/or chosen timestamps (the "(0:17)" marks in the
+scene's comments). Nothing is encoded, so this takes seconds on a CPU:
+
+    python keyframes.py render manime.py ForwardPropagationDemo --at 0:17 0:40
+
+writes PNGs to keyframes/ForwardPropagationDemo/. The check compares
+perceptual hashes of those frames with goldens in goldens/<Scene>.json and
+fails when any of them moved more than a few bits. No goldens are shipped:
+they depend on the installed manim, Pango and fonts, so record them where
+the check will run and commit them:
+
+    python keyframes.py check manime.py ForwardPropagationDemo --update   # record goldens
+    python keyframes.py check manime.py ForwardPropagationDemo            # exit 1 on drift
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from manim import *
+import numpy as np
+from PIL import Image
+
+from scene_base import load_scene_class
+
+DEFAULT_SIZE = (320, 180)
+# Play numbers depend on the frame rate (see CoalescingScene), so pin it
+DEFAULT_FRAME_RATE = 60
+HASH_SIZE = 8
+
+
+def parse_time(text):
+    """'0:17', '(0:17)', '1:02.5' or '12.5' -> seconds."""
+    match = re.fullmatch(r"\(?\s*(?:(\d+):)?(\d+(?:\.\d+)?)\s*\)?", str(text).strip())
+    if match is None:
+        raise ValueError(f"bad timestamp {text!r}, expected M:SS or seconds")
+    return 60 * int(match[1] or 0) + float(match[2])
+
+
+def parse_size(text):
+    match = re.fullmatch(r"(\d+)x(\d+)", text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"bad size {text!r}, expected WIDTHxHEIGHT")
+    return int(match[1]), int(match[2])
+
+
+def dct_matrix(n):
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+DCT = dct_matrix(4 * HASH_SIZE)
+
+
+def phash(image):
+    """64-bit perceptual hash (low DCT frequencies above their median) as hex."""
+    n = 4 * HASH_SIZE
+    gray = np.asarray(image.convert("L").resize((n, n), Image.LANCZOS), dtype=float)
+    low = (DCT @ gray @ DCT.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    # The DC term is the overall brightness, keep it out of the median
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def capture_keyframes(file, scene, at=(), plays=True, size=DEFAULT_SIZE, frame_rate=DEFAULT_FRAME_RATE):
+    """Run `scene` without rendering video and return {name: PIL image}.
+
+    Frames are named play0001.. (end state of each play) and by timestamp as
+    given in `at`, e.g. "0:17".
+    """
+    scene_class = load_scene_class(file, scene)
+    times = sorted((parse_time(t), str(t).strip("() ")) for t in at)
+    frames = {}
+
+    with tempconfig({"dry_run": True, "pixel_width": size[0], "pixel_height": size[1], "frame_rate": frame_rate}):
+        instance = scene_class(skip_animations=True)
+        renderer = instance.renderer
+        clock = {"now": 0.0, "plays": 0}
+
+        def snapshot(name):
+            renderer.update_frame(instance, ignore_skipping=True)
+            frames[name] = renderer.camera.get_image().convert("RGB")
+
+        begin_animations = instance.begin_animations
+
+        def timed_begin_animations():
+            begin_animations()
+            # Animations are skipped, so keep the video clock ourselves
+            start = clock["now"]
+            clock["now"] += instance.get_run_time(instance.animations)
+            while times and times[0][0] < clock["now"]:
+                seconds, name = times.pop(0)
+                instance.update_to_time(seconds - start)
+                snapshot(f"at_{name.replace(':', '-')}")
+
+        play = instance.play
+
+        def capturing_play(*args, **kwargs):
+            result = play(*args, **kwargs)
+            clock["plays"] += 1
+            if plays:
+                snapshot(f"play{clock['plays']:04d}")
+            return result
+
+        instance.begin_animations = timed_begin_animations
+        instance.play = capturing_play
+        instance.render()
+        # Timestamps past the end show the last frame
+        for _, name in times:
+            snapshot(f"at_{name.replace(':', '-')}")
+    return frames
+
+
+def save_keyframes(frames, directory):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for old in directory.glob("*.png"):
+        old.unlink()
+    for name, image in frames.items():
+        image.save(directory / f"{name}.png")
+
+
+def check(frames, golden, threshold=4):
+    """[(name, problem)] for frames that differ from the golden hashes."""
+    expected = golden["frames"]
+    problems = []
+    for name, image in frames.items():
+        if name not in expected:
+            problems.append((name, "no golden"))
+            continue
+        distance = hamming(phash(image), expected[name])
+        if distance > threshold:
+            problems.append((name, f"{distance} bits off"))
+    problems += [(name, "missing") for name in expected if name not in frames]
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Low-resolution keyframes and golden-frame checks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command, text in (("render", "write keyframes as PNG"), ("check", "compare keyframes with goldens")):
+        p = sub.add_parser(command, help=text)
+        p.add_argument("file")
+        p.add_argument("scene")
+        p.add_argument("--at", nargs="*", default=(), help="timestamps to capture, e.g. 0:17 0:40")
+        p.add_argument("--no-plays", dest="plays", action="store_false", help="skip the end of every play")
+        p.add_argument("--size", type=parse_size, default=DEFAULT_SIZE, help="WIDTHxHEIGHT (default 320x180)")
+        p.add_argument("--fps", type=int, default=DEFAULT_FRAME_RATE, help="frame rate plays are counted at (default 60)")
+        p.add_argument("-o", "--output", default="keyframes", help="folder for the PNGs")
+    checking = sub.choices["check"]
+    checking.add_argument("--golden", default="goldens", help="folder of golden hash files")
+    checking.add_argument("--threshold", type=int, default=4, help="bits a frame may differ (of 64)")
+    checking.add_argument("--update", action="store_true", help="record the current frames as goldens")
+    args = parser.parse_args(argv)
+
+    frames = capture_keyframes(args.file, args.scene, args.at, args.plays, args.size, args.fps)
+    save_keyframes(frames, Path(args.output) / args.scene)
+    if args.command == "render":
+        print(f"{len(frames)} keyframes written to {Path(args.output) / args.scene}")
+        return 0
+
+    path = Path(args.golden) / f"{args.scene}.json"
+    if args.update:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        golden = {"size": list(args.size), "fps": args.fps, "frames": {name: phash(image) for name, image in frames.items()}}
+        path.write_text(json.dumps(golden, indent=2) + "\n")
+        print(f"{len(frames)} golden hashes written to {path}")
+        return 0
+    if not path.exists():
+        print(f"no goldens at {path}; record them with --update and commit them")
+        return 1
+    golden = json.loads(path.read_text())
+    if tuple(golden["size"]) != args.size:
+        print(f"goldens were recorded at {golden['size'][0]}x{golden['size'][1]}, use --size to match")
+        return 1
+    if golden.get("fps", DEFAULT_FRAME_RATE) != args.fps:
+        print(f"goldens were recorded at {golden['fps']} fps, use --fps to match")
+        return 1
+    problems = check(frames, golden, args.threshold)
+    for name, problem in problems:
+        print(f"{name}: {problem}")
+    print(f"{len(frames)} keyframes checked, {len(problems)} problems")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
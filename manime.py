@@ -1,153 +1,392 @@
+import hashlib
+import json
+
 from manim import *
 import numpy as np
 
-class ForwardPropagationDemo(Scene):
+from asset_cache import SharedAssetScene
+from caching import LABELS, PLOTS, cached_text
+from checkpoint import CheckpointScene
+from mobjects import CreateEdges, EdgeBundle, FollowSnapshots, GlyphReadout, Heatmap, SweepHeatmap
+from network import (
+    ACTIVATIONS,
+    DEFAULT_SPEC,
+    NetworkSpec,
+    edge_endpoints,
+    format_signed,
+    format_value,
+    forward,
+    grid_to_screen,
+    layer_positions,
+    layout_edge_labels,
+    minibatch,
+    node_radius,
+    subscript,
+    train_steps,
+)
+from profiling import ProfiledScene
+from rendering import FrozenBackgroundScene, MultiResolutionScene, PipelinedScene
+from scene_base import LifecycleScene
+from streaming import StreamingScene
+from timeline import CoalescingScene
+
+# Color definitions
+WHITE = "#FFFFFF"
+CYAN = "#00FFFF"
+LIGHT_GREY = "#CCCCCC"
+YELLOW = "#FFD700"
+NARRATION = (
+    "And that is forward propagation. A simple, repeatable process of math "
+    "that turns an input vector into a meaningful prediction."
+)
+# Colors used to pair each multiplication term with its input and weight
+TERM_COLORS = ["#FF6B6B", "#4ECDC4", "#FFD93D"]
+# Resting colors of the hidden-layer sum terms (red, cyan, blue)
+CALC_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1"]
+
+
+# Coordinate system: (0,0) to (100,100) grid
+def to_screen_coords(x, y):
+    # Convert from (0,100) grid to Manim coordinates
+    return grid_to_screen([(x, y)])[0]
+
+
+class ForwardPropagationDemo(
+    CoalescingScene,
+    FrozenBackgroundScene,
+    MultiResolutionScene,
+    ProfiledScene,
+    PipelinedScene,
+    StreamingScene,
+    SharedAssetScene,
+    LifecycleScene,
+    CheckpointScene,
+):
+    # Network to animate. Subclass and override (or assign a NetworkSpec before
+    # rendering) to animate another architecture, e.g. NetworkSpec.random([8, 16, 16, 4]).
+    spec = DEFAULT_SPEC
+    # How many terms of a weighted sum get the pulse treatment
+    highlight_terms = 3
+    # Color (by sign) and thicken (by magnitude) connections from their weights
+    color_edges_by_weight = False
+    # Scene methods a timeline may use as steps
+    timeline_steps = (
+        "show_network_and_inputs",
+        "compute_hidden_node",
+        "activate_hidden_node",
+        "populate_layer",
+        "compute_output_node",
+        "activate_output_node",
+        "show_prediction",
+    )
+    # State built in construct() and by earlier steps that later steps use
+    checkpoint_attributes = (
+        "spec",
+        "zs",
+        "activations",
+        "activation_fn",
+        "formula",
+        "y_range",
+        "grid",
+        "positions",
+        "value_font_size",
+        "nodes",
+        "values",
+        "pending",
+    )
+
     def construct(self):
-        # Color definitions
-        WHITE = "#FFFFFF"
-        CYAN = "#00FFFF"
-        LIGHT_GREY = "#CCCCCC"
-        YELLOW = "#FFD700"
-        
-        # Coordinate system: (0,0) to (100,100) grid
-        def to_screen_coords(x, y):
-            # Convert from (0,100) grid to Manim coordinates
-            return np.array([(x - 50) * 0.14, (50 - y) * 0.08, 0])
-        
+        # The order of steps and their editable content (labels, narration)
+        # come from the timeline; see timelines/forward_propagation.json
+        timeline = self.get_timeline()
+        if "network" in timeline:
+            self.spec = NetworkSpec.from_dict(timeline["network"])
+        spec = self.spec
+        # Every number shown in the video comes from this single forward pass
+        self.zs, self.activations = forward(spec, self.network_inputs())
+        self.activation_fn, self.formula, self.y_range = ACTIVATIONS[spec.activation]
+
         # Create nodes
-        input_nodes = []
-        hidden_nodes = []
-        output_node = None
-        
-        # Input nodes at (15, 30), (15, 50), (15, 70)
-        input_positions = [(15, 30), (15, 50), (15, 70)]
-        for i, pos in enumerate(input_positions):
-            node = Circle(radius=0.25, color=WHITE)
-            node.move_to(to_screen_coords(pos[0], pos[1]))
-            input_nodes.append(node)
-        
-        # Hidden nodes at (50, 30), (50, 50), (50, 70)
-        hidden_positions = [(50, 30), (50, 50), (50, 70)]
-        for i, pos in enumerate(hidden_positions):
-            node = Circle(radius=0.25, color=WHITE)
-            node.move_to(to_screen_coords(pos[0], pos[1]))
-            hidden_nodes.append(node)
-        
-        # Output node at (85, 50)
-        output_node = Circle(radius=0.25, color=WHITE)
-        output_node.move_to(to_screen_coords(85, 50))
-        
-        # Part 1: Network & Input Setup (0:00 - 0:08)
-        
+        self.grid = layer_positions(spec.layer_sizes)
+        self.positions = [grid_to_screen(p) for p in self.grid]
+        radius = node_radius(spec.layer_sizes)
+        # Text inside the nodes shrinks along with the circles
+        self.value_font_size = 16 * radius / 0.25
+        self.nodes = [
+            [Circle(radius=radius, color=WHITE).move_to(point) for point in layer]
+            for layer in self.positions
+        ]
+        # On-screen value Text of every node, filled in as the pass progresses
+        self.values = [[None] * n for n in spec.layer_sizes]
+        # Mobjects a calculation step leaves on screen for its activation step
+        self.pending = {}
+
+        self.run_timeline(timeline)
+
+    def network_inputs(self):
+        # None runs spec.inputs, a single sample
+        return None
+
+    def default_timeline(self):
+        # Part 1, then for every layer: detail one node, apply the activation,
+        # quickly populate the rest of the layer; finally the prediction
+        last = len(self.spec.layer_sizes) - 1
+        segments = [{"title": "Part 1: Network & Input Setup", "step": "show_network_and_inputs"}]
+        for layer in range(1, last):
+            segments += [
+                {"title": f"Part 2: Calculating Hidden Node (layer {layer})",
+                 "step": "compute_hidden_node", "params": {"layer": layer}},
+                {"title": f"Part 3: Activation of Hidden Node (layer {layer})",
+                 "step": "activate_hidden_node", "params": {"layer": layer}},
+                {"title": f"Part 4: Completing the Layer (layer {layer})",
+                 "step": "populate_layer", "params": {"layer": layer}},
+            ]
+        segments += [
+            {"title": "Part 5: Output Calculation", "step": "compute_output_node"},
+            {"title": "Part 6: Final Prediction", "step": "activate_output_node"},
+        ]
+        if self.spec.layer_sizes[last] > 1:
+            segments.append({"title": "Part 6: Completing the Output Layer",
+                             "step": "populate_layer", "params": {"layer": last}})
+        segments.append({"title": "Part 6: Prediction & Narration", "step": "show_prediction"})
+        return {"version": 1, "segments": segments}
+
+    def tear_down(self):
+        super().tear_down()
+        # Report how much Pango layout the label cache saved this render
+        logger.info("Label cache: %(hits)d hits, %(misses)d misses, %(size)d cached", LABELS.stats())
+        logger.info("Plot cache: %(hits)d hits, %(disk_hits)d from disk, %(misses)d misses", PLOTS.stats())
+        logger.info("Background buffer: %d reused, %d rasterized", self.background_hits, self.background_misses)
+        logger.info("Coalesced %d play() calls into neighbouring segments", self.coalesced_plays)
+
+    def show_network_and_inputs(self, column_labels=None, vector_label="Input Vector x"):
+        spec = self.spec
+        grid = self.grid
+        all_nodes = [node for layer in self.nodes for node in layer]
+
         # (0:01) APPEAR: All Nodes
         self.play(
-            *[FadeIn(node) for node in input_nodes + hidden_nodes + [output_node]],
+            *[FadeIn(node) for node in all_nodes],
             run_time=2
         )
-        
+
         # (0:03) APPEAR: Column Labels
-        input_label = Text("INPUT", color=WHITE, font_size=24)
-        input_label.move_to(to_screen_coords(15, 10))
-        
-        hidden_label = Text("HIDDEN", color=WHITE, font_size=24)
-        hidden_label.move_to(to_screen_coords(50, 10))
-        
-        output_label = Text("OUTPUT", color=WHITE, font_size=24)
-        output_label.move_to(to_screen_coords(85, 10))
-        
-        self.play(
-            FadeIn(input_label),
-            FadeIn(hidden_label),
-            FadeIn(output_label),
+        if column_labels is None:
+            n_hidden = len(spec.layer_sizes) - 2
+            column_labels = ["INPUT"] + [
+                "HIDDEN" if n_hidden == 1 else f"HIDDEN {i + 1}" for i in range(n_hidden)
+            ] + ["OUTPUT"]
+        labels = []
+        for name, layer in zip(column_labels, grid):
+            label = cached_text(name, color=WHITE, font_size=24)
+            label.move_to(to_screen_coords(layer[0][0], 10))
+            labels.append(label)
+
+        self.play(
+            *[FadeIn(label) for label in labels],
             run_time=2
         )
-        
+
         # (0:05) DISAPPEAR: Column Labels
         self.play(
-            FadeOut(input_label),
-            FadeOut(hidden_label),
-            FadeOut(output_label),
+            *[FadeOut(label) for label in labels],
             run_time=1
         )
-        
+
         # (0:06) APPEAR: Input Values
-        input_values = []
-        input_texts = ["0.5", "0.8", "0.2"]
-        for i, (node, text) in enumerate(zip(input_nodes, input_texts)):
-            value_text = Text(text, color=CYAN, font_size=16)
+        for i, (node, value) in enumerate(zip(self.nodes[0], self.activations[0])):
+            value_text = cached_text(format_value(value), color=CYAN, font_size=self.value_font_size)
             value_text.move_to(node.get_center())
-            input_values.append(value_text)
-        
+            self.values[0][i] = value_text
+
         self.play(
-            *[FadeIn(value) for value in input_values],
+            *[FadeIn(value) for value in self.values[0]],
             run_time=1
         )
-        
+
         # (0:07) APPEAR: Vector Label
         # Create brackets around input nodes
-        bracket_left = Text("[", color=CYAN, font_size=36)
-        bracket_left.move_to(to_screen_coords(8, 50))
-        
-        bracket_right = Text("]", color=CYAN, font_size=36)
-        bracket_right.move_to(to_screen_coords(22, 50))
-        
-        vector_label = Text("Input Vector x", color=CYAN, font_size=20)
-        vector_label.move_to(to_screen_coords(15, 85))
-        
+        x = grid[0][0][0]
+        bracket_left = cached_text("[", color=CYAN, font_size=36)
+        bracket_left.move_to(to_screen_coords(x - 7, 50))
+
+        bracket_right = cached_text("]", color=CYAN, font_size=36)
+        bracket_right.move_to(to_screen_coords(x + 7, 50))
+
+        # Tall input columns get brackets stretched to cover every node
+        column_height = self.positions[0][0][1] - self.positions[0][-1][1]
+        if column_height > bracket_left.height:
+            bracket_left.stretch_to_fit_height(column_height)
+            bracket_right.stretch_to_fit_height(column_height)
+
+        label = cached_text(vector_label, color=CYAN, font_size=20)
+        label.move_to(to_screen_coords(x, 85))
+
         self.play(
             FadeIn(bracket_left),
             FadeIn(bracket_right),
-            FadeIn(vector_label),
+            FadeIn(label),
             run_time=1
         )
-        
-        # Part 2: Calculating Hidden Node 1 (0:09 - 0:17)
-        
-        # (0:09) ACTION: Isolate Calculation
-        # Focus on the calculation without dimming other elements
-        run_time=1
-        
-        # (0:10) APPEAR: Connections & Weights
-        connections = []
-        weights = []
-        weight_values = ["w₁₃ = 0.2", "w₂₃ = 0.4", "w₃₃ = -0.3"]
-        
-        for i, (input_node, weight_text) in enumerate(zip(input_nodes, weight_values)):
-            # Create connection line
-            line = Line(
-                input_node.get_center(),
-                hidden_nodes[2].get_center(),
-                color=WHITE,
-                stroke_width=2
-            )
-            connections.append(line)
-            
-            # Create weight text positioned just above the connection line
-            weight = Text(weight_text, color=WHITE, font_size=16)
-            # Position weight at midpoint of connection line, but slightly above
-            start_pos = input_node.get_center()
-            end_pos = hidden_nodes[2].get_center()
-            mid_point = (start_pos + end_pos) / 2
-            
-            # Calculate angle to rotate weight text to match connection line
-            angle = np.arctan2(end_pos[1] - start_pos[1], end_pos[0] - start_pos[0])
-            
-            # Move weight slightly above the connection line
-            offset_distance = 0.15  # Distance above the line
-            offset_x = -offset_distance * np.sin(angle)
-            offset_y = offset_distance * np.cos(angle)
-            weight.move_to(mid_point + np.array([offset_x, offset_y, 0]))
-            
+
+    def edge_bundle(self, starts, ends, weights, stroke_width):
+        if not self.color_edges_by_weight:
+            weights = None
+        return EdgeBundle(
+            starts, ends, weights,
+            color=WHITE, negative_color=TERM_COLORS[0], stroke_width=stroke_width
+        )
+
+    def connect_to(self, layer, focus, names):
+        # Connection lines from every node of the previous layer into `focus`,
+        # each with its weight written along the line. Labels are laid out
+        # together so they don't cover each other or the nodes.
+        starts = self.positions[layer - 1]
+        ends = np.repeat(self.positions[layer][focus][None], len(starts), axis=0)
+        weight_row = self.spec.weights[layer - 1][focus]
+        connections = self.edge_bundle(starts, ends, weight_row, stroke_width=2)
+
+        weights = [
+            cached_text(f"{name} = {format_value(w)}", color=WHITE, font_size=16)
+            for name, w in zip(names, weight_row)
+        ]
+        nodes = self.nodes[layer - 1] + self.nodes[layer]
+        anchors, angles, _ = layout_edge_labels(
+            starts, ends,
+            [(weight.width, weight.height) for weight in weights],
+            offset=0.15,
+            obstacles=(
+                np.concatenate([self.positions[layer - 1], self.positions[layer]]),
+                [(node.width, node.height) for node in nodes],
+            ),
+        )
+        for weight, anchor, angle in zip(weights, anchors, angles):
+            weight.move_to(anchor)
             weight.rotate(angle)
-            
-            weights.append(weight)
-        
+        return connections, weights
+
+    def pulse_terms(self, terms, values, weights, run_time):
+        # Upscale each multiplication term together with its input and weight.
+        # The up/down pairs are merged into a single segment.
+        with self.coalesce():
+            for k, (term, value, weight) in enumerate(zip(terms, values, weights)):
+                if k >= self.highlight_terms:
+                    break
+                color = TERM_COLORS[k % len(TERM_COLORS)]
+                self.play(
+                    term.animate.scale(1.3).set_color(color),
+                    value.animate.set_color(color).scale(1.2),
+                    weight.animate.set_color(color).scale(1.2),
+                    run_time=run_time
+                )
+                self.play(
+                    term.animate.scale(1/1.3),
+                    value.animate.scale(1/1.2),
+                    weight.animate.scale(1/1.2),
+                    run_time=run_time
+                )
+
+    def activation_graph(self):
+        # Activation function graph shown next to the output column. The
+        # geometry comes from the plot cache, so it is sampled once per
+        # activation and reused across sections and renders.
+        axes, graph = PLOTS.axes_with_graph(
+            self.activation_fn,
+            x_range=[-3, 3, 1],
+            y_range=self.y_range,
+            x_length=3,
+            y_length=2,
+            axis_config={"color": YELLOW},
+            graph_color=YELLOW,
+        )
+        offset = to_screen_coords(75, 30) - axes.get_center()
+        axes.shift(offset)
+        graph.shift(offset)
+
+        formula = cached_text(self.formula, color=YELLOW, font_size=14)
+        formula.move_to(to_screen_coords(75, 15))
+        return axes, graph, formula
+
+    def apply_activation(self, axes, graph, formula, source, layer, focus, create_time):
+        z = self.zs[layer - 1][focus]
+        a = self.activations[layer][focus]
+        node = self.nodes[layer][focus]
+        # Keep the dot on the visible part of the x axis for large |z|
+        x = float(np.clip(z, -3, 3))
+
+        self.play(
+            Create(axes),
+            Create(graph),
+            FadeIn(formula),
+            run_time=create_time
+        )
+
+        # Upscale formula
+        with self.coalesce():
+            self.play(
+                formula.animate.scale(1.2),
+                run_time=0.3
+            )
+
+            self.play(
+                formula.animate.scale(1/1.2),
+                run_time=0.3
+            )
+
+        # ANIMATION: Apply Function
+        # Create dot that moves along the activation function
+        dot = Dot(color=YELLOW, radius=0.05)
+        dot.move_to(axes.c2p(x, a))
+
+        # Create path for dot movement
+        path = VMobject()
+        path.set_points_as_corners([
+            source.get_center(),
+            axes.c2p(x, 0),
+            axes.c2p(x, a)
+        ])
+
+        self.play(
+            MoveAlongPath(dot, path),
+            run_time=2
+        )
+
+        # ANIMATION: Set Node Value
+        # Move dot to the node
+        path_to_node = Line(dot.get_center(), node.get_center())
+
+        value = cached_text(format_value(a), color=YELLOW, font_size=self.value_font_size)
+        value.move_to(node.get_center())
+        self.values[layer][focus] = value
+
         self.play(
-            *[Create(line) for line in connections],
+            MoveAlongPath(dot, path_to_node),
+            FadeIn(value),
+            run_time=2
+        )
+        return dot
+
+    def compute_hidden_node(self, layer):
+        # Part 2: Calculating Hidden Node (0:09 - 0:17)
+        spec = self.spec
+        focus = spec.layer_sizes[layer] - 1
+        inputs = self.activations[layer - 1]
+        weight_row = spec.weights[layer - 1][focus]
+        bias = spec.biases[layer - 1][focus]
+        products = inputs * weight_row
+        total = products.sum()
+
+        # (0:10) APPEAR: Connections & Weights
+        names = [f"w{subscript(i + 1, focus + 1)}" for i in range(len(inputs))]
+        connections, weights = self.connect_to(layer, focus, names)
+        input_values = self.values[layer - 1]
+
+        self.play(
+            CreateEdges(connections),
             *[FadeIn(weight) for weight in weights],
             run_time=2
         )
-        
+
         # (0:12) ANIMATION: Show Weighted Sum
         # Make input values and weights stand out
         self.play(
@@ -155,438 +394,528 @@ class ForwardPropagationDemo(Scene):
             *[weight.animate.set_color(WHITE) for weight in weights],
             run_time=1
         )
-        
+
         # Show calculation with individual colored terms
         # Create separate text objects for each multiplication term
-        calc_part1 = Text("Sum = (", color=LIGHT_GREY, font_size=18)
-        calc_part2 = Text("0.5 × 0.2", color="#FF6B6B", font_size=18)  # Red
-        calc_part3 = Text(") + (", color=LIGHT_GREY, font_size=18)
-        calc_part4 = Text("0.8 × 0.4", color="#4ECDC4", font_size=18)  # Cyan
-        calc_part5 = Text(") + (", color=LIGHT_GREY, font_size=18)
-        calc_part6 = Text("0.2 × -0.3", color="#45B7D1", font_size=18)  # Blue
-        calc_part7 = Text(")", color=LIGHT_GREY, font_size=18)
-        
+        terms = [
+            cached_text(f"{format_value(x)} × {format_value(w)}",
+                 color=CALC_COLORS[k % len(CALC_COLORS)], font_size=18)
+            for k, (x, w) in enumerate(zip(inputs, weight_row))
+        ]
+        calc_parts = [cached_text("Sum = (", color=LIGHT_GREY, font_size=18)]
+        for k, term in enumerate(terms):
+            if k:
+                calc_parts.append(cached_text(") + (", color=LIGHT_GREY, font_size=18))
+            calc_parts.append(term)
+        calc_parts.append(cached_text(")", color=LIGHT_GREY, font_size=18))
+
         # Position the calculation parts
-        calc_parts = [calc_part1, calc_part2, calc_part3, calc_part4, calc_part5, calc_part6, calc_part7]
         calc_group = VGroup(*calc_parts).arrange(RIGHT, buff=0.1)
         calc_group.move_to(to_screen_coords(50, 85))
-        
+        if calc_group.width > config.frame_width - 1:
+            calc_group.scale_to_fit_width(config.frame_width - 1)
+
         self.play(
             FadeIn(calc_group),
             run_time=2
         )
-        
-        # Upscale first multiplication term
-        self.play(
-            calc_part2.animate.scale(1.3).set_color("#FF6B6B"),  # Red
-            input_values[0].animate.set_color("#FF6B6B").scale(1.2),
-            weights[0].animate.set_color("#FF6B6B").scale(1.2),
-            run_time=0.8
-        )
-        self.play(
-            calc_part2.animate.scale(1/1.3),
-            input_values[0].animate.scale(1/1.2),
-            weights[0].animate.scale(1/1.2),
-            run_time=0.8
-        )
-        # Upscale second multiplication term
-        self.play(
-            calc_part4.animate.scale(1.3).set_color("#4ECDC4"),  # Cyan
-            input_values[1].animate.set_color("#4ECDC4").scale(1.2),
-            weights[1].animate.set_color("#4ECDC4").scale(1.2),
-            run_time=0.8
-        )
-        self.play(
-            calc_part4.animate.scale(1/1.3),
-            input_values[1].animate.scale(1/1.2),
-            weights[1].animate.scale(1/1.2),
-            run_time=0.8
-        )
-        # Upscale third multiplication term
-        self.play(
-            calc_part6.animate.scale(1.3).set_color("#FFD93D"),  # Yellow
-            input_values[2].animate.set_color("#FFD93D").scale(1.2),
-            weights[2].animate.set_color("#FFD93D").scale(1.2),
-            run_time=0.8
-        )
-        self.play(
-            calc_part6.animate.scale(1/1.3),
-            input_values[2].animate.scale(1/1.2),
-            weights[2].animate.scale(1/1.2),
-            run_time=0.8
-        )
-        
+
+        self.pulse_terms(terms, input_values, weights, run_time=0.8)
+
         # (0:14) ANIMATION: Add Bias
-        result_text = Text("Sum = 0.36", color=LIGHT_GREY, font_size=18)
+        result_text = cached_text(f"Sum = {format_value(total)}", color=LIGHT_GREY, font_size=18)
         result_text.move_to(to_screen_coords(50, 85))
-        
-        bias_text = Text("Bias b₃ = -0.1", color=LIGHT_GREY, font_size=18)
+
+        bias_text = cached_text(f"Bias b{subscript(focus + 1)} = {format_value(bias)}", color=LIGHT_GREY, font_size=18)
         bias_text.move_to(to_screen_coords(50, 75))
-        
-        final_calc = Text("z₃ = 0.36 + (-0.1) = 0.26", color=LIGHT_GREY, font_size=18)
+
+        final_calc = cached_text(
+            f"z{subscript(focus + 1)} = {format_value(total)} + {format_signed(bias)}"
+            f" = {format_value(self.zs[layer - 1][focus])}",
+            color=LIGHT_GREY,
+            font_size=18
+        )
         final_calc.move_to(to_screen_coords(50, 85))
-        
+
         self.play(
             Transform(calc_group, result_text),
             FadeIn(bias_text),
             run_time=1
         )
-        
+
         self.play(
             Transform(calc_group, final_calc),
             run_time=2
         )
-        
+        # The Transform targets were never on screen
+        self.release(result_text, final_calc)
+
         # (0:17) DISAPPEAR: Weights
         self.play(
             *[FadeOut(weight) for weight in weights],
             run_time=1
         )
-        
-        # Part 3: Activation of Hidden Node 1 (0:18 - 0:24)
-        
-        # (0:18) APPEAR: Sigmoid Graph
-        # Create sigmoid function
-        axes = Axes(
-            x_range=[-3, 3, 1],
-            y_range=[0, 1, 0.2],
-            x_length=3,
-            y_length=2,
-            axis_config={"color": YELLOW}
-        )
-        axes.move_to(to_screen_coords(75, 30))
-        
-        sigmoid = axes.plot(lambda x: 1 / (1 + np.exp(-x)), color=YELLOW)
-        
-        # Add sigmoid formula
-        sigmoid_formula = Text(
-            "σ(x) = 1 / (1 + e^(-x))",
-            color=YELLOW,
-            font_size=14
-        )
-        sigmoid_formula.move_to(to_screen_coords(75, 15))
-        
-        self.play(
-            Create(axes),
-            Create(sigmoid),
-            FadeIn(sigmoid_formula),
-            run_time=2
-        )
-        
-        # Upscale sigmoid formula
-        self.play(
-            sigmoid_formula.animate.scale(1.2),
-            run_time=0.3
-        )
-        
-        self.play(
-            sigmoid_formula.animate.scale(1/1.2),
-            run_time=0.3
-        )
-        
-        # (0:20) ANIMATION: Apply Function
-        # Create dot that moves along sigmoid
-        dot = Dot(color=YELLOW, radius=0.05)
-        dot.move_to(axes.c2p(0.26, 0.56))
-        
-        # Create path for dot movement
-        path = VMobject()
-        path.set_points_as_corners([
-            calc_group.get_center(),
-            axes.c2p(0.26, 0),
-            axes.c2p(0.26, 0.56)
-        ])
-        
-        self.play(
-            MoveAlongPath(dot, path),
-            run_time=2
-        )
-        
-        # (0:22) ANIMATION: Set Node Value
-        # Move dot to hidden node
-        path_to_node = Line(dot.get_center(), hidden_nodes[2].get_center())
-        
-        # Create value text for hidden node
-        hidden_value = Text("0.56", color=YELLOW, font_size=16)
-        hidden_value.move_to(hidden_nodes[2].get_center())
-        
-        self.play(
-            MoveAlongPath(dot, path_to_node),
-            FadeIn(hidden_value),
-            run_time=2
-        )
-        
+        self.release(*weights)
+        self.pending = {"calc": calc_group, "bias": bias_text, "connections": connections}
+
+    def activate_hidden_node(self, layer):
+        # Part 3: Activation of Hidden Node (0:18 - 0:24)
+        focus = self.spec.layer_sizes[layer] - 1
+        calc_group = self.pending["calc"]
+        bias_text = self.pending["bias"]
+        connections = self.pending["connections"]
+
+        # (0:18) APPEAR: Activation Graph
+        axes, graph, formula = self.activation_graph()
+        dot = self.apply_activation(axes, graph, formula, calc_group, layer, focus, create_time=2)
+
         # (0:24) DISAPPEAR: Cleanup
         self.play(
             FadeOut(axes),
-            FadeOut(sigmoid),
-            FadeOut(sigmoid_formula),
+            FadeOut(graph),
+            FadeOut(formula),
             FadeOut(dot),
-            *[FadeOut(line) for line in connections],
+            FadeOut(connections),
             FadeOut(calc_group),
             FadeOut(bias_text),
             run_time=1
         )
-        
-        # Part 4: Completing the Hidden Layer (0:25 - 0:26)
-        
+        self.release(axes, graph, formula, dot, connections, calc_group, bias_text)
+        self.pending = {}
+
+    def populate_layer(self, layer):
+        # Part 4: Completing the Layer (0:25 - 0:26)
         # (0:25) ACTION: Quick Populate & Restore
-        # Continue with next step
-        run_time=0.5
-        
+        others = [j for j in range(self.spec.layer_sizes[layer]) if self.values[layer][j] is None]
+        if not others:
+            return
+
         # Flash of connections and values
-        flash_lines = []
-        for i, input_node in enumerate(input_nodes):
-            for j, hidden_node in enumerate(hidden_nodes):
-                if j != 2:  # Skip the one we already calculated
-                    line = Line(
-                        input_node.get_center(),
-                        hidden_node.get_center(),
-                        color=WHITE,
-                        stroke_width=1
-                    )
-                    flash_lines.append(line)
-        
-        # Create values for other hidden nodes
+        starts, ends = edge_endpoints(self.positions[layer - 1], self.positions[layer][others])
+        # Edges are ordered source-major, matching the transposed weight rows
+        flash_lines = self.edge_bundle(
+            starts, ends, self.spec.weights[layer - 1][others].T, stroke_width=1
+        )
+
+        # Create values for the other nodes
         other_values = []
-        other_texts = ["0.34", "0.82"]
-        for i, (node, text) in enumerate(zip(hidden_nodes[:2], other_texts)):
-            value = Text(text, color=YELLOW, font_size=16)
-            value.move_to(node.get_center())
+        for j in others:
+            value = cached_text(format_value(self.activations[layer][j]), color=YELLOW, font_size=self.value_font_size)
+            value.move_to(self.nodes[layer][j].get_center())
+            self.values[layer][j] = value
             other_values.append(value)
-        
+
         self.play(
-            *[Create(line) for line in flash_lines],
+            CreateEdges(flash_lines),
             run_time=0.3
         )
-        
+
         self.play(
-            *[FadeOut(line) for line in flash_lines],
+            FadeOut(flash_lines),
             *[FadeIn(value) for value in other_values],
             run_time=0.3
         )
-        
+        self.release(flash_lines)
+
+    def compute_output_node(self, layer=None):
         # Part 5: Output Calculation (0:27 - 0:33)
-        
-        # (0:27) ACTION: Isolate Output
-        # Focus on output calculation
-        run_time=1
-        
+        spec = self.spec
+        if layer is None:
+            layer = len(spec.layer_sizes) - 1
+        focus = spec.layer_sizes[layer] - 1
+        inputs = self.activations[layer - 1]
+        weight_row = spec.weights[layer - 1][focus]
+        bias = spec.biases[layer - 1][focus]
+        z = self.zs[layer - 1][focus]
+
         # (0:28) APPEAR: Final Connections & Weights
-        output_connections = []
-        output_weights = []
-        weight_texts = ["wₒ₁ = 0.9", "wₒ₂ = -0.5", "wₒ₃ = 0.7"]
-        
-        for i, (hidden_node, weight_text) in enumerate(zip(hidden_nodes, weight_texts)):
-            # Create connection line
-            line = Line(
-                hidden_node.get_center(),
-                output_node.get_center(),
-                color=WHITE,
-                stroke_width=2
-            )
-            output_connections.append(line)
-            
-            # Create weight text positioned just above the connection line
-            weight = Text(weight_text, color=WHITE, font_size=16)
-            # Position weight at midpoint of connection line, but slightly above
-            start_pos = hidden_node.get_center()
-            end_pos = output_node.get_center()
-            mid_point = (start_pos + end_pos) / 2
-            
-            # Calculate angle to rotate weight text to match connection line
-            angle = np.arctan2(end_pos[1] - start_pos[1], end_pos[0] - start_pos[0])
-            
-            # Move weight slightly above the connection line
-            offset_distance = 0.15  # Distance above the line
-            offset_x = -offset_distance * np.sin(angle)
-            offset_y = offset_distance * np.cos(angle)
-            weight.move_to(mid_point + np.array([offset_x, offset_y, 0]))
-            
-            weight.rotate(angle)
-            
-            output_weights.append(weight)
-        
+        if spec.layer_sizes[layer] == 1:
+            names = [f"wₒ{subscript(i + 1)}" for i in range(len(inputs))]
+        else:
+            names = [f"w{subscript(i + 1, focus + 1)}" for i in range(len(inputs))]
+        output_connections, output_weights = self.connect_to(layer, focus, names)
+
         self.play(
-            *[Create(line) for line in output_connections],
+            CreateEdges(output_connections),
             *[FadeIn(weight) for weight in output_weights],
             run_time=2
         )
-        
+
         # (0:30) ANIMATION: Show Final Weighted Sum & Bias
-        final_calc_text = Text(
-            "zₒ = (0.34×0.9) + (0.82×-0.5) + (0.56×0.7) + 0.2 = 0.488",
-            color=LIGHT_GREY,
-            font_size=16
-        )
-        final_calc_text.move_to(to_screen_coords(50, 5))
         # Create colored terms for output calculation
-        out_term1 = Text("0.34×0.9", color="#FF6B6B", font_size=16)
-        out_term2 = Text("0.82×-0.5", color="#4ECDC4", font_size=16)
-        out_term3 = Text("0.56×0.7", color="#FFD93D", font_size=16)
-        out_plus1 = Text(" + ", color=LIGHT_GREY, font_size=16)
-        out_plus2 = Text(" + ", color=LIGHT_GREY, font_size=16)
-        out_plus3 = Text(" + 0.2 = 0.488", color=LIGHT_GREY, font_size=16)
-        out_calc_group = VGroup(out_term1, out_plus1, out_term2, out_plus2, out_term3, out_plus3).arrange(RIGHT, buff=0.08)
+        out_terms = [
+            cached_text(f"{format_value(x)}×{format_value(w)}", color=TERM_COLORS[k % len(TERM_COLORS)], font_size=16)
+            for k, (x, w) in enumerate(zip(inputs, weight_row))
+        ]
+        out_parts = []
+        for k, term in enumerate(out_terms):
+            if k:
+                out_parts.append(cached_text(" + ", color=LIGHT_GREY, font_size=16))
+            out_parts.append(term)
+        out_parts.append(cached_text(f" + {format_signed(bias)} = {format_value(z)}", color=LIGHT_GREY, font_size=16))
+        out_calc_group = VGroup(*out_parts).arrange(RIGHT, buff=0.08)
         out_calc_group.move_to(to_screen_coords(50, 5))
+        if out_calc_group.width > config.frame_width - 1:
+            out_calc_group.scale_to_fit_width(config.frame_width - 1)
         self.play(FadeIn(out_calc_group), run_time=1)
         # Animate each output multiplication term and corresponding hidden node/weight
+        self.pulse_terms(out_terms, self.values[layer - 1], output_weights, run_time=0.7)
+
+        # (0:33) DISAPPEAR: Weights
         self.play(
-            out_term1.animate.scale(1.3).set_color("#FF6B6B"),
-            other_values[0].animate.set_color("#FF6B6B").scale(1.2),
-            output_weights[0].animate.set_color("#FF6B6B").scale(1.2),
-            run_time=0.7
+            *[FadeOut(weight) for weight in output_weights],
+            run_time=1
         )
+        self.release(*output_weights)
+        self.pending = {"calc": out_calc_group, "connections": output_connections}
+
+    def activate_output_node(self, layer=None):
+        # Part 6: Final Prediction (0:34 - 0:43)
+        if layer is None:
+            layer = len(self.spec.layer_sizes) - 1
+        focus = self.spec.layer_sizes[layer] - 1
+        out_calc_group = self.pending["calc"]
+        output_connections = self.pending["connections"]
+
+        # (0:34) APPEAR: Activation Graph
+        axes, graph, formula = self.activation_graph()
+        dot = self.apply_activation(axes, graph, formula, out_calc_group, layer, focus, create_time=1)
+
+        # (0:39) DISAPPEAR: Final Cleanup
         self.play(
-            out_term1.animate.scale(1/1.3),
-            other_values[0].animate.scale(1/1.2),
-            output_weights[0].animate.scale(1/1.2),
-            run_time=0.7
+            FadeOut(axes),
+            FadeOut(graph),
+            FadeOut(formula),
+            FadeOut(dot),
+            FadeOut(output_connections),
+            run_time=1
         )
-        self.play(
-            out_term2.animate.scale(1.3).set_color("#4ECDC4"),
-            other_values[1].animate.set_color("#4ECDC4").scale(1.2),
-            output_weights[1].animate.set_color("#4ECDC4").scale(1.2),
-            run_time=0.7
+        self.release(axes, graph, formula, dot, output_connections)
+        self.pending = {"calc": out_calc_group}
+
+    def show_prediction(self, layer=None, label="Final Prediction", narration=NARRATION):
+        if layer is None:
+            layer = len(self.spec.layer_sizes) - 1
+
+        # (0:40) APPEAR: Final Prediction Label
+        # With several outputs the prediction is the most activated one
+        winner = int(np.argmax(self.activations[layer]))
+        output_node = self.nodes[layer][winner]
+        prediction_box = Rectangle(
+            width=output_node.width + 0.1,
+            height=output_node.height + 0.1,
+            color=YELLOW,
+            stroke_width=3
         )
+        prediction_box.move_to(output_node.get_center())
+
+        prediction_label = cached_text(label, color=YELLOW, font_size=20)
+        prediction_label.move_to(to_screen_coords(self.grid[layer][0][0], 20))
+
         self.play(
-            out_term2.animate.scale(1/1.3),
-            other_values[1].animate.scale(1/1.2),
-            output_weights[1].animate.scale(1/1.2),
-            run_time=0.7
+            Create(prediction_box),
+            FadeIn(prediction_label),
+            run_time=1
+        )
+
+        # (0:41) APPEAR: Narration Text
+        narration_text = cached_text(
+            narration,
+            color=WHITE,
+            font_size=16,
+            line_spacing=0.8
         )
+        narration_text.move_to(to_screen_coords(50, 90))
+
         self.play(
-            out_term3.animate.scale(1.3).set_color("#FFD93D"),
-            hidden_value.animate.set_color("#FFD93D").scale(1.2),
-            output_weights[2].animate.set_color("#FFD93D").scale(1.2),
-            run_time=0.7
+            FadeIn(narration_text),
+            run_time=2
         )
+
+        # (0:43) Fade to black
         self.play(
-            out_term3.animate.scale(1/1.3),
-            hidden_value.animate.scale(1/1.2),
-            output_weights[2].animate.scale(1/1.2),
-            run_time=0.7
+            FadeOut(Group(*self.mobjects)),
+            run_time=2
         )
-        
-       
-        # (0:33) DISAPPEAR: Weights
+
+
+class MinibatchDemo(ForwardPropagationDemo):
+    # Number of samples pushed through the network together
+    batch_size = 128
+    batch_seed = 0
+    timeline_steps = ("show_network_and_batch", "propagate_batch", "show_batch_predictions")
+    checkpoint_attributes = ForwardPropagationDemo.checkpoint_attributes + ("batch", "edges", "heatmaps")
+
+    def network_inputs(self):
+        # One (batch, features) matrix: every layer is a single matrix multiply
+        self.batch = minibatch(self.spec, self.batch_size, self.batch_seed)
+        return self.batch
+
+    def default_timeline(self):
+        segments = [{"title": "Part 1: Network & Minibatch", "step": "show_network_and_batch"}]
+        for layer in range(1, len(self.spec.layer_sizes)):
+            segments.append({"title": f"Part {layer + 1}: Layer {layer} for the Whole Batch",
+                             "step": "propagate_batch", "params": {"layer": layer}})
+        segments.append({"title": "Final: Batch Predictions", "step": "show_batch_predictions"})
+        return {"version": 1, "segments": segments}
+
+    def heatmap_name(self, layer):
+        last = len(self.spec.layer_sizes) - 1
+        if layer == 0:
+            return "X"
+        if layer == last:
+            return "ŷ"
+        return "H" if last == 2 else f"H{subscript(layer)}"
+
+    def show_network_and_batch(self):
+        spec = self.spec
+        all_nodes = [node for layer in self.nodes for node in layer]
         self.play(
-            *[FadeOut(weight) for weight in output_weights],
+            *[FadeIn(node) for node in all_nodes],
+            run_time=2
+        )
+
+        # Every connection, dimmed until its layer is computed
+        self.edges = []
+        for layer in range(1, len(spec.layer_sizes)):
+            starts, ends = edge_endpoints(self.positions[layer - 1], self.positions[layer])
+            edges = self.edge_bundle(starts, ends, spec.weights[layer - 1].T, stroke_width=1)
+            edges.set_stroke(opacity=0.3)
+            self.edges.append(edges)
+        self.play(
+            *[CreateEdges(edges) for edges in self.edges],
             run_time=1
         )
-        
-        # Part 6: Final Prediction (0:34 - 0:43)
-        
-        # (0:34) APPEAR: Sigmoid Graph
-        axes2 = Axes(
-            x_range=[-3, 3, 1],
-            y_range=[0, 1, 0.2],
-            x_length=3,
-            y_length=2,
-            axis_config={"color": YELLOW}
-        )
-        axes2.move_to(to_screen_coords(75, 30))
-        
-        sigmoid2 = axes2.plot(lambda x: 1 / (1 + np.exp(-x)), color=YELLOW)
-        
-        # Add sigmoid formula for final activation
-        sigmoid_formula2 = Text(
-            "σ(x) = 1 / (1 + e^(-x))",
-            color=YELLOW,
-            font_size=14
+
+        # One heatmap per layer under its column: a row per node, a column per sample
+        low, high = self.y_range[:2]
+        self.heatmaps = []
+        for layer, (activations, column) in enumerate(zip(self.activations, self.grid)):
+            heatmap = Heatmap(
+                activations.T,
+                value_range=(0, 1) if layer == 0 else (low, high),
+                colors=("#000000", CYAN if layer == 0 else YELLOW),
+                width=3.6,
+                height=min(0.8, 0.2 * activations.shape[1]),
+            )
+            heatmap.move_to(to_screen_coords(column[0][0], 90))
+            self.heatmaps.append(heatmap)
+
+        label = self.heatmap_label(0, CYAN)
+        self.play(
+            SweepHeatmap(self.heatmaps[0]),
+            FadeIn(label),
+            run_time=2
         )
-        sigmoid_formula2.move_to(to_screen_coords(75, 15))
-        
+
+    def heatmap_label(self, layer, color):
+        shape = self.activations[layer].shape
+        label = cached_text(f"{self.heatmap_name(layer)}  ({shape[1]} × {shape[0]})", color=color, font_size=14)
+        label.move_to(to_screen_coords(self.grid[layer][0][0], 98))
+        return label
+
+    def propagate_batch(self, layer):
+        edges = self.edges[layer - 1]
+        fn_name = self.formula.split("(")[0]
+        previous = "X" if layer == 1 else self.heatmap_name(layer - 1)
+        formula = cached_text(
+            f"{self.heatmap_name(layer)} = {fn_name}({previous} · W{subscript(layer)}ᵀ + b{subscript(layer)})",
+            color=LIGHT_GREY,
+            font_size=18
+        )
+        formula.move_to(to_screen_coords(50, 8))
+
+        # The weights of this layer light up: one matrix multiply for all samples
         self.play(
-            Create(axes2),
-            Create(sigmoid2),
-            FadeIn(sigmoid_formula2),
+            edges.animate.set_stroke(opacity=1),
+            FadeIn(formula),
             run_time=1
         )
-        
-        # Upscale final sigmoid formula
+
         self.play(
-            sigmoid_formula2.animate.scale(1.2),
-            run_time=0.3
+            SweepHeatmap(self.heatmaps[layer]),
+            FadeIn(self.heatmap_label(layer, YELLOW)),
+            run_time=2
         )
-        
+
         self.play(
-            sigmoid_formula2.animate.scale(1/1.2),
-            run_time=0.3
+            edges.animate.set_stroke(opacity=0.3),
+            FadeOut(formula),
+            run_time=0.5
         )
-        
-        # (0:35) ANIMATION: Apply Function
-        dot2 = Dot(color=YELLOW, radius=0.05)
-        dot2.move_to(axes2.c2p(0.488, 0.62))
-        
-        path2 = VMobject()
-        path2.set_points_as_corners([
-            final_calc_text.get_center(),
-            axes2.c2p(0.488, 0),
-            axes2.c2p(0.488, 0.62)
-        ])
-        
+        self.release(formula)
+
+    def show_batch_predictions(self):
+        predictions = self.activations[-1]
+        box = SurroundingRectangle(self.heatmaps[-1], color=YELLOW, buff=0.05)
+        summary = cached_text(
+            f"{len(predictions)} samples, {len(self.spec.weights)} matrix multiplies, "
+            f"mean prediction {format_value(predictions.mean(), 2)}",
+            color=WHITE,
+            font_size=16
+        )
+        summary.move_to(to_screen_coords(50, 8))
+
         self.play(
-            MoveAlongPath(dot2, path2),
-            run_time=2
+            Create(box),
+            FadeIn(summary),
+            run_time=1
         )
-        
-        # (0:37) ANIMATION: Set Final Value
-        path_to_output = Line(dot2.get_center(), output_node.get_center())
-        
-        output_value = Text("0.62", color=YELLOW, font_size=16)
-        output_value.move_to(output_node.get_center())
-        
+        self.wait(1)
+
         self.play(
-            MoveAlongPath(dot2, path_to_output),
-            FadeIn(output_value),
+            FadeOut(Group(*self.mobjects)),
             run_time=2
         )
-        
-        # (0:39) DISAPPEAR: Final Cleanup
+
+
+class TrainingDemo(ForwardPropagationDemo):
+    # Toy task: is x₁ + x₂ above 1? Learned from a fixed batch by full-batch gradient descent.
+    training_size = 64
+    training_seed = 0
+    learning_rate = 2.0
+    training_steps = 1000
+    # Training steps per second of video; several steps can land on one frame
+    steps_per_second = 50
+    # Frames of loss history drawn in the loss plot
+    loss_history = 200
+    timeline_steps = ("show_network_for_training", "train", "show_trained_network")
+    checkpoint_attributes = ForwardPropagationDemo.checkpoint_attributes + (
+        "batch", "targets", "edges", "loss_box", "loss_curve", "losses", "readout", "step_readout", "loss_readout",
+    )
+
+    def network_inputs(self):
+        self.batch = minibatch(self.spec, self.training_size, self.training_seed)
+        self.targets = (self.batch[:, 0] + self.batch[:, 1] > 1).astype(float)
+        return None
+
+    def default_timeline(self):
+        return {"version": 1, "segments": [
+            {"title": "Part 1: Network & Training Data", "step": "show_network_for_training"},
+            {"title": "Part 2: Training", "step": "train", "params": {"steps": self.training_steps}},
+            {"title": "Part 3: Trained Network", "step": "show_trained_network"},
+        ]}
+
+    def show_network_for_training(self):
+        spec = self.spec
+        all_nodes = [node for layer in self.nodes for node in layer]
         self.play(
-            FadeOut(axes2),
-            FadeOut(sigmoid2),
-            FadeOut(sigmoid_formula2),
-            FadeOut(dot2),
-            *[FadeOut(line) for line in output_connections],
-            FadeOut(final_calc_text),
-            run_time=1
-        )
-        
-        # (0:40) APPEAR: Final Prediction Label
-        prediction_box = Rectangle(
-            width=0.6,
-            height=0.6,
-            color=YELLOW,
-            stroke_width=3
+            *[FadeIn(node) for node in all_nodes],
+            run_time=2
         )
-        prediction_box.move_to(output_node.get_center())
-        
-        prediction_label = Text("Final Prediction", color=YELLOW, font_size=20)
-        prediction_label.move_to(to_screen_coords(85, 20))
-        
+
+        # Edges are always colored by weight here: that's what training changes
+        self.edges = []
+        for layer in range(1, len(spec.layer_sizes)):
+            starts, ends = edge_endpoints(self.positions[layer - 1], self.positions[layer])
+            self.edges.append(EdgeBundle(
+                starts, ends, spec.weights[layer - 1].T,
+                color=WHITE, negative_color=TERM_COLORS[0], stroke_width=2
+            ))
+
+        # Loss plot: a fixed window of the last loss_history frames
+        self.loss_box = Rectangle(width=6, height=1.2, color=LIGHT_GREY, stroke_width=1)
+        self.loss_box.move_to(to_screen_coords(50, 88))
+        self.loss_curve = VMobject(stroke_color=YELLOW, stroke_width=2)
+        self.losses = np.full(self.loss_history, np.nan)
+        # Step and loss change every frame: glyph slots, not a new Text per value
+        self.step_readout = GlyphReadout(5, color=LIGHT_GREY, font_size=16)
+        self.loss_readout = GlyphReadout(6, color=LIGHT_GREY, font_size=16)
+        self.readout = VGroup(
+            cached_text("step", color=LIGHT_GREY, font_size=16),
+            self.step_readout,
+            cached_text("loss", color=LIGHT_GREY, font_size=16),
+            self.loss_readout,
+        ).arrange(RIGHT, buff=0.25)
+        self.readout.move_to(to_screen_coords(50, 8))
+        self.step_readout.set_text("0".rjust(5))
+        self.loss_readout.set_text("")
+
         self.play(
-            Create(prediction_box),
-            FadeIn(prediction_label),
+            *[CreateEdges(edges) for edges in self.edges],
+            FadeIn(self.loss_box),
+            FadeIn(self.readout),
             run_time=1
         )
-        
-        # (0:41) APPEAR: Narration Text
-        narration = Text(
-            "And that is forward propagation. A simple, repeatable process of math that turns an input vector into a meaningful prediction.",
+        self.add(self.loss_curve)
+
+    def train(self, steps=1000, learning_rate=None):
+        if learning_rate is None:
+            learning_rate = self.learning_rate
+        snapshots = train_steps(self.spec, self.batch, self.targets, learning_rate, steps)
+        self.delta_scale = 1e-12
+        all_nodes = [node for layer in self.nodes for node in layer]
+        # Everything the snapshots depend on, so the play hash changes with them
+        digest = hashlib.sha256(json.dumps(
+            {"spec": self.spec.to_dict(), "learning_rate": learning_rate, "steps": steps,
+             "loss_history": self.loss_history},
+            sort_keys=True,
+        ).encode())
+        digest.update(np.ascontiguousarray(self.batch, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(self.targets, dtype=float).tobytes())
+        # Everything a training step changes, updated in place frame after frame
+        animation = FollowSnapshots(
+            Group(*self.edges, *all_nodes, self.loss_curve, self.readout),
+            snapshots, steps, self.show_training_step, fingerprint=digest.hexdigest(),
+            run_time=steps / self.steps_per_second
+        )
+        self.play(animation)
+        snapshots.close()
+
+        # Later steps show the trained network
+        last = animation.snapshot
+        self.spec = NetworkSpec(
+            self.spec.layer_sizes, [w.copy() for w in last.weights], [b.copy() for b in last.biases],
+            self.spec.inputs, self.spec.activation, self.spec.decimals,
+        )
+        self.zs, self.activations = forward(self.spec)
+
+    def show_training_step(self, snapshot):
+        for edges, weights in zip(self.edges, snapshot.weights):
+            edges.set_weights(weights.T)
+
+        # Node fill: activation for the first sample; outline: how much gradient flows through it
+        deltas = [np.abs(delta).mean(axis=0) for delta in snapshot.deltas]
+        self.delta_scale = max(self.delta_scale, max(delta.max() for delta in deltas))
+        for layer, nodes in enumerate(self.nodes):
+            for j, node in enumerate(nodes):
+                node.set_fill(interpolate_color(BLACK, YELLOW, np.clip(snapshot.activations[layer][0, j], 0, 1)),
+                              opacity=0.6)
+                if layer:
+                    node.set_stroke(interpolate_color(WHITE, TERM_COLORS[0],
+                                                      deltas[layer - 1][j] / self.delta_scale))
+
+        self.losses[:-1] = self.losses[1:]
+        self.losses[-1] = snapshot.loss
+        known = ~np.isnan(self.losses)
+        if known.sum() > 1:
+            box = self.loss_box
+            x = np.linspace(box.get_left()[0], box.get_right()[0], len(self.losses))[known]
+            scale = np.nanmax(self.losses) or 1
+            y = box.get_bottom()[1] + box.height * self.losses[known] / scale
+            self.loss_curve.set_points_as_corners(np.column_stack([x, y, np.zeros_like(x)]))
+
+        self.step_readout.set_text(f"{snapshot.step + 1:5d}")
+        self.loss_readout.set_text(f"{snapshot.loss:.4f}")
+
+    def show_trained_network(self):
+        prediction = self.activations[-1][0]
+        target = self.targets[0]
+        summary = cached_text(
+            f"Sample 1: prediction {format_value(prediction, 2)}, target {format_value(target, 0)}",
             color=WHITE,
-            font_size=16,
-            line_spacing=0.8
+            font_size=18
         )
-        narration.move_to(to_screen_coords(50, 90))
-        
+        summary.move_to(to_screen_coords(50, 20))
+        box = SurroundingRectangle(self.nodes[-1][0], color=YELLOW, buff=0.05)
+
         self.play(
-            FadeIn(narration),
-            run_time=2
+            Create(box),
+            FadeIn(summary),
+            run_time=1
         )
-        
-        # (0:43) Fade to black
+        self.wait(1)
+
         self.play(
             FadeOut(Group(*self.mobjects)),
             run_time=2
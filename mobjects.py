@@ -0,0 +1,353 @@
+import weakref
+
+from manim import *
+import numpy as np
+
+# Per-mobject arrays that make up its geometry and style
+ARRAY_ATTRIBUTES = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+STYLE_ATTRIBUTES = ("color", "stroke_width", "background_stroke_width", "z_index")
+
+
+def line_segment_points(starts, ends):
+    """Bezier control points for straight segments, 4 points per segment."""
+    t = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+    return (starts[:, None, :] + t * (ends - starts)[:, None, :]).reshape(-1, 3)
+
+
+class EdgeBundle(VGroup):
+    """All connections between two layers drawn as one mobject.
+
+    Instead of one Line per edge, the segments live in two contiguous
+    (n_edges, 3) arrays. When weights are given, edges are styled from them:
+    positive and negative weights get `color` and `negative_color`, and the
+    stroke width grows with |w| in `levels` steps. Cairo can only stroke a
+    path with one color and width, so edges sharing a style are packed into
+    one VMobject each; there are 2 * levels submobjects (some possibly
+    empty) no matter how many edges there are, and set_weights() restyles
+    the edges without building new ones.
+    """
+
+    def __init__(
+        self,
+        starts,
+        ends,
+        weights=None,
+        color=WHITE,
+        negative_color=None,
+        stroke_width=2,
+        levels=4,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.edge_starts = np.asarray(starts, dtype=float)
+        self.edge_ends = np.asarray(ends, dtype=float)
+        if negative_color is None:
+            negative_color = color
+        self.levels = levels
+        self.progress = 1
+
+        # One part per style, in style order; set_weights() only moves edges between them
+        if weights is None:
+            self.add(VMobject(stroke_color=color, stroke_width=stroke_width))
+        else:
+            for key in range(2 * levels):
+                width = stroke_width * (0.25 + 0.75 * (key // 2 + 1) / levels)
+                self.add(VMobject(stroke_color=negative_color if key % 2 else color, stroke_width=width))
+        self.set_weights(weights)
+
+    def set_weights(self, weights):
+        """Restyle the edges for new weights in place, e.g. once per training step."""
+        n = len(self.edge_starts)
+        if weights is None:
+            keys = np.zeros(n, dtype=int)
+        else:
+            if len(self.submobjects) == 1:
+                raise ValueError("this bundle was built without weights")
+            weights = np.asarray(weights, dtype=float).ravel()
+            if len(weights) != n:
+                raise ValueError(f"got {len(weights)} weights for {n} edges")
+            magnitude = np.abs(weights)
+            scale = magnitude.max() if magnitude.max() > 0 else 1
+            level = np.minimum((magnitude / scale * self.levels).astype(int), self.levels - 1)
+            keys = 2 * level + (weights < 0)
+
+        # Sort edges by style so every submobject owns a contiguous slice
+        order = np.argsort(keys, kind="stable")
+        self.edge_order = order
+        self.starts = self.edge_starts[order]
+        self.ends = self.edge_ends[order]
+        bounds = np.searchsorted(keys[order], np.arange(len(self.submobjects) + 1))
+        self.slices = [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        return self.set_progress(self.progress)
+
+    def set_progress(self, alpha):
+        # Draw every edge from its start up to `alpha` of its length
+        self.progress = alpha
+        tips = self.starts + alpha * (self.ends - self.starts)
+        for part, sl in zip(self.submobjects, self.slices):
+            part.set_points(line_segment_points(self.starts[sl], tips[sl]))
+        return self
+
+
+class CreateEdges(Animation):
+    """Grow all edges of an EdgeBundle at once, like a Create per Line."""
+
+    def __init__(self, bundle, **kwargs):
+        super().__init__(bundle, introducer=True, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_progress(self.rate_func(alpha))
+
+
+def nbytes(mobjects):
+    """Bytes held in the point and color arrays of exactly these mobjects."""
+    total = 0
+    for mob in mobjects:
+        for name in ARRAY_ATTRIBUTES:
+            array = getattr(mob, name, None)
+            if isinstance(array, np.ndarray):
+                total += array.nbytes
+    return total
+
+
+def restore(mobject, template):
+    """Make `mobject` look exactly like `template` again, reusing its arrays.
+
+    Returns False (and leaves the mobject alone) when the two families don't
+    have the same shape, e.g. after a Transform added submobjects.
+    """
+    family = mobject.get_family()
+    originals = template.get_family()
+    if len(family) != len(originals):
+        return False
+    for mob, original in zip(family, originals):
+        for name in ARRAY_ATTRIBUTES:
+            source = getattr(original, name, None)
+            if source is None:
+                continue
+            target = getattr(mob, name, None)
+            if isinstance(target, np.ndarray) and target.shape == source.shape:
+                np.copyto(target, source)
+            else:
+                setattr(mob, name, np.array(source))
+        for name in STYLE_ATTRIBUTES:
+            if hasattr(original, name):
+                setattr(mob, name, getattr(original, name))
+        mob.clear_updaters()
+    return True
+
+
+class MobjectPool:
+    """Free lists of mobjects that left the scene, recycled instead of rebuilt.
+
+    acquire(key, template) hands out a released mobject of the same key,
+    reset in place to look like `template`, or a fresh copy of the template.
+    release() takes back mobjects that were handed out and won't be used
+    again, keeping at most `maxsize` per key.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self._free = {}
+        self._keys = weakref.WeakKeyDictionary()
+
+    def acquire(self, key, template):
+        free = self._free.get(key)
+        while free:
+            mob = free.pop()
+            if restore(mob, template):
+                self.reused += 1
+                break
+        else:
+            self.created += 1
+            mob = template.copy()
+        self._keys[mob] = key
+        return mob
+
+    def release(self, *mobjects):
+        for mob in mobjects:
+            for member in mob.get_family():
+                key = self._keys.pop(member, None)
+                if key is None:
+                    continue
+                free = self._free.setdefault(key, [])
+                if len(free) < self.maxsize:
+                    free.append(member)
+                    self.released += 1
+
+    def discard(self, key):
+        self._free.pop(key, None)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "pooled": sum(len(free) for free in self._free.values()),
+        }
+
+    def clear(self):
+        self._free.clear()
+        self._keys.clear()
+        self.created = self.reused = self.released = 0
+
+
+# Shared by every scene in the process
+POOL = MobjectPool()
+
+
+def color_lut(colors, size=256):
+    """(size, 4) uint8 RGBA table running linearly through hex `colors`."""
+    stops = np.array([[int(c.lstrip("#")[i:i + 2], 16) for i in (0, 2, 4)] for c in colors], dtype=float)
+    x = np.linspace(0, len(colors) - 1, size)
+    rgb = np.column_stack([np.interp(x, np.arange(len(colors)), stops[:, k]) for k in range(3)])
+    return np.column_stack([rgb, np.full(size, 255)]).astype(np.uint8)
+
+
+class Heatmap(ImageMobject):
+    """A (rows, cols) matrix drawn as an image, one block per entry.
+
+    Values are mapped to colors through a lookup table into a pixel buffer
+    allocated once. set_values() and show_columns() only write into that
+    buffer, so updating a 512-sample batch costs about the same per frame
+    as a 3-sample one, and no Text is built per value.
+    """
+
+    def __init__(
+        self,
+        values,
+        value_range=(0, 1),
+        colors=("#000000", "#FFD700"),
+        empty_color="#222222",
+        width=3,
+        height=1,
+        **kwargs
+    ):
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        self.value_range = value_range
+        self.lut = color_lut(colors)
+        self.empty = color_lut([empty_color], size=1)[0]
+        self.values = values
+        self.colored = self.lut[self.color_index(values)]
+        # Built from the colored buffer so ImageMobject records full opacity
+        super().__init__(self.colored.copy(), **kwargs)
+        self.shown = values.shape[1]
+        # Keep entries as crisp blocks when the image is scaled up
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        self.stretch_to_fit_width(width)
+        self.stretch_to_fit_height(height)
+
+    def color_index(self, values):
+        lo, hi = self.value_range
+        scaled = (values - lo) / ((hi - lo) or 1)
+        return np.clip(scaled * (len(self.lut) - 1), 0, len(self.lut) - 1).astype(int)
+
+    def set_values(self, values, columns=slice(None)):
+        self.values[:, columns] = values
+        self.colored[:, columns] = self.lut[self.color_index(self.values[:, columns])]
+        np.copyto(self.pixel_array[:, columns], self.colored[:, columns])
+        self.shown = self.values.shape[1]
+        return self
+
+    def show_columns(self, n):
+        """Show the first n columns (samples) and blank out the rest."""
+        n = int(np.clip(n, 0, self.values.shape[1]))
+        if n > self.shown:
+            np.copyto(self.pixel_array[:, self.shown:n], self.colored[:, self.shown:n])
+        elif n < self.shown:
+            self.pixel_array[:, n:self.shown] = self.empty
+        self.shown = n
+        return self
+
+
+class SweepHeatmap(Animation):
+    """Fill a heatmap in column by column, one sample after the other."""
+
+    def __init__(self, heatmap, **kwargs):
+        super().__init__(heatmap, introducer=True, **kwargs)
+
+    def begin(self):
+        self.mobject.show_columns(0)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.show_columns(round(self.rate_func(alpha) * self.mobject.values.shape[1]))
+
+
+class FollowSnapshots(Animation):
+    """Play a stream of snapshots (e.g. training steps) as one animation.
+
+    `snapshots` is an iterator of `count` items, consumed evenly over the
+    run time; every frame calls show(snapshot) with the newest one, which
+    should change the existing mobjects in place. However many steps there
+    are, it is one play(), one partial movie file and no new mobjects.
+
+    manim's play hash can't look inside an iterator, so pass a `fingerprint`
+    string of whatever determines the snapshots; otherwise a cached partial
+    movie is reused after they change.
+    """
+
+    def __init__(self, mobject, snapshots, count, show, fingerprint=None, **kwargs):
+        self.snapshots = iter(snapshots)
+        self.count = count
+        self.show = show
+        self.fingerprint = fingerprint
+        super().__init__(mobject, rate_func=linear, **kwargs)
+
+    def begin(self):
+        self.consumed = 0
+        self.snapshot = None
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        target = min(self.count, int(np.ceil(alpha * self.count)))
+        while self.consumed < target:
+            self.snapshot = next(self.snapshots)
+            self.consumed += 1
+        if self.snapshot is not None:
+            self.show(self.snapshot)
+
+
+class GlyphReadout(VGroup):
+    """A fixed number of character slots that can show a new string every frame.
+
+    The characters in `alphabet` are laid out once, on one baseline;
+    set_text() copies their outlines into the slots in place. Unlike a new
+    Text per frame, this lays out nothing and writes no SVG however many
+    different values are shown. Characters outside the alphabet show blank.
+    """
+
+    def __init__(self, width, alphabet="0123456789.-", color=WHITE, font_size=16, **kwargs):
+        super().__init__(**kwargs)
+        text = Text(alphabet, color=color, font_size=font_size)
+        glyphs = text.submobjects
+        baseline = text.get_center()
+        self.glyphs = {
+            char: glyph.points - [glyph.get_center()[0], baseline[1], 0]
+            for char, glyph in zip(alphabet, glyphs)
+        }
+        self.cell = 1.1 * max(glyph.width for glyph in glyphs)
+        # Moves along with the slots and marks where the first one starts
+        self.anchor = VectorizedPoint(ORIGIN)
+        self.add(self.anchor)
+        for i in range(width):
+            slot = VMobject()
+            slot.match_style(glyphs[0])
+            self.add(slot)
+        self.slots = self.submobjects[1:]
+        # Full-width layout at first, so the readout has its final size
+        self.set_text(alphabet[0] * width)
+
+    def set_text(self, text):
+        origin = self.anchor.get_center()
+        for i, slot in enumerate(self.slots):
+            char = text[i] if i < len(text) else " "
+            glyph = self.glyphs.get(char)
+            if glyph is None:
+                slot.clear_points()
+            else:
+                slot.set_points(glyph + origin + [(i + 0.5) * self.cell, 0, 0])
+        return self
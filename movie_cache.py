@@ -0,0 +1,245 @@
+"""Bookkeeping and garbage collection for manim's partial movie files.
+
+manim writes one segment per play() call to
+media/videos/<module>/<quality>/partial_movie_files/<Scene>/<hash>.mp4, where
+the file name is already a hash of the camera, animations and mobjects, and
+lists the segments used by the latest render in partial_movie_file_list.txt.
+This tool indexes those segments, derives reuse from the list files, keeps the
+directory under a disk budget by evicting the least recently used segments
+and removes directories of scenes that no longer exist in the source file.
+
+    python movie_cache.py stats
+    python movie_cache.py gc --budget 200MB
+    python movie_cache.py gc --dry-run
+
+Run it after renders (or let manim run with a high --max_files_cached and
+leave the budget to this tool).
+"""
+import argparse
+import ast
+import json
+import re
+import shutil
+import time
+from pathlib import Path
+
+INDEX_NAME = "partial_movie_cache.json"
+LIST_NAME = "partial_movie_file_list.txt"
+UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024**2, "MB": 1024**2, "G": 1024**3, "GB": 1024**3}
+
+
+def parse_size(text):
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?B?)\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size {text!r}, expected e.g. 500MB or 2G")
+    return int(float(match.group(1)) * UNITS[match.group(2)])
+
+
+def format_size(n):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+
+
+def scene_classes(source):
+    # Every class defined in the module counts, scenes may subclass each other
+    tree = ast.parse(source.read_text(encoding="utf-8"))
+    return {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+
+
+class MovieCache:
+    def __init__(self, media_dir="media", source_dir="."):
+        self.videos = Path(media_dir) / "videos"
+        self.source_dir = Path(source_dir)
+        self.index_path = self.videos / INDEX_NAME
+        if self.index_path.exists():
+            self.index = json.loads(self.index_path.read_text())
+        else:
+            self.index = {"segments": {}, "lists": {}, "stats": {}}
+        self.stats = self.index["stats"]
+        for name in ["hits", "misses", "bytes_reclaimed", "evicted", "orphans_removed"]:
+            self.stats.setdefault(name, 0)
+
+    def scene_dirs(self):
+        return sorted(p for p in self.videos.glob("*/*/partial_movie_files/*") if p.is_dir())
+
+    def key(self, scene_dir):
+        module, quality, _, scene = scene_dir.relative_to(self.videos).parts
+        return f"{module}/{quality}/{scene}"
+
+    def segment_path(self, key):
+        module, quality, scene, name = key.split("/")
+        return self.videos / module / quality / "partial_movie_files" / scene / name
+
+    def scan(self):
+        """Bring the index in line with the disk and count reuse from list files."""
+        segments = self.index["segments"]
+        lists = self.index["lists"]
+        seen = set()
+        for scene_dir in self.scene_dirs():
+            scene_key = self.key(scene_dir)
+            for file in scene_dir.glob("*.mp4"):
+                key = f"{scene_key}/{file.name}"
+                seen.add(key)
+                if key not in segments:
+                    stat = file.stat()
+                    segments[key] = {
+                        "hash": file.stem,
+                        "size": stat.st_size,
+                        "first_seen": stat.st_mtime,
+                        "last_used": stat.st_mtime,
+                    }
+
+            list_file = scene_dir / LIST_NAME
+            if not list_file.exists():
+                continue
+            list_time = list_file.stat().st_mtime
+            previous = lists.get(scene_key)
+            if previous is not None and list_time <= previous:
+                continue
+            for name in self.listed(list_file):
+                key = f"{scene_key}/{name}"
+                file = scene_dir / name
+                if key not in segments or not file.exists():
+                    continue
+                # Segments written before the previous render finished were
+                # reused by this one; anything newer had to be rendered.
+                # Without a previous render there is nothing to compare to.
+                if previous is not None:
+                    if file.stat().st_mtime <= previous:
+                        self.stats["hits"] += 1
+                    else:
+                        self.stats["misses"] += 1
+                segments[key]["last_used"] = list_time
+            lists[scene_key] = list_time
+
+        for key in set(segments) - seen:
+            del segments[key]
+        return self
+
+    @staticmethod
+    def listed(list_file):
+        # Lines look like: file 'file:/abs/path/to/<hash>.mp4' (possibly a Windows path)
+        names = []
+        for line in list_file.read_text(encoding="utf-8").splitlines():
+            match = re.match(r"file '(?:file:)?(.*)'", line.strip())
+            if match:
+                names.append(re.split(r"[\\/]", match.group(1))[-1])
+        return names
+
+    def orphans(self):
+        """Scene directories whose scene class is gone from <module>.py."""
+        classes = {}
+        orphans = []
+        for scene_dir in self.scene_dirs():
+            module, _, scene = self.key(scene_dir).split("/")
+            if module not in classes:
+                source = self.source_dir / f"{module}.py"
+                # Without the source we can't tell, so keep everything
+                classes[module] = scene_classes(source) if source.exists() else None
+            if classes[module] is not None and scene not in classes[module]:
+                orphans.append(scene_dir)
+        return orphans
+
+    def remove(self, file, dry_run):
+        size = file.stat().st_size
+        if not dry_run:
+            file.unlink()
+            self.stats["bytes_reclaimed"] += size
+        return size
+
+    def gc(self, budget=None, remove_orphans=True, dry_run=False):
+        """Delete orphaned scene directories, then LRU-evict down to `budget` bytes."""
+        self.scan()
+        segments = self.index["segments"]
+        reclaimed = 0
+        removed = []
+
+        if remove_orphans:
+            for scene_dir in self.orphans():
+                scene_key = self.key(scene_dir)
+                for file in scene_dir.iterdir():
+                    if file.is_file():
+                        reclaimed += self.remove(file, dry_run)
+                removed.append(scene_key)
+                if not dry_run:
+                    shutil.rmtree(scene_dir)
+                    self.stats["orphans_removed"] += 1
+                    self.index["lists"].pop(scene_key, None)
+                    for key in [k for k in segments if k.startswith(scene_key + "/")]:
+                        del segments[key]
+
+        evicted = []
+        if budget is not None:
+            live = {k: s for k, s in segments.items() if k.rsplit("/", 1)[0] not in removed}
+            total = sum(s["size"] for s in live.values())
+            for key, segment in sorted(live.items(), key=lambda item: item[1]["last_used"]):
+                if total <= budget:
+                    break
+                file = self.segment_path(key)
+                if file.exists():
+                    reclaimed += self.remove(file, dry_run)
+                total -= segment["size"]
+                evicted.append(key)
+            if not dry_run:
+                for key in evicted:
+                    del segments[key]
+                self.stats["evicted"] += len(evicted)
+
+        if not dry_run:
+            self.save()
+        return {"orphans": removed, "evicted": evicted, "bytes_reclaimed": reclaimed}
+
+    def report(self):
+        self.scan()
+        segments = self.index["segments"].values()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "segments": len(segments),
+            "bytes": sum(s["size"] for s in segments),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            **self.stats,
+        }
+
+    def save(self):
+        self.videos.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.index, indent=1))
+        tmp.replace(self.index_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage manim's partial movie file cache.")
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--source-dir", default=".", help="where the scene modules live")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="index segments and print cache statistics")
+    gc = commands.add_parser("gc", help="remove orphaned scenes and evict down to a budget")
+    gc.add_argument("--budget", type=parse_size, help="maximum total size, e.g. 500MB")
+    gc.add_argument("--keep-orphans", action="store_true")
+    gc.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    cache = MovieCache(args.media_dir, args.source_dir)
+    if args.command == "gc":
+        start = time.perf_counter()
+        result = cache.gc(args.budget, not args.keep_orphans, args.dry_run)
+        verb = "Would remove" if args.dry_run else "Removed"
+        for scene in result["orphans"]:
+            print(f"{verb} orphaned scene {scene}")
+        print(f"{verb} {len(result['evicted'])} segments, "
+              f"{format_size(result['bytes_reclaimed'])} in {time.perf_counter() - start:.2f}s")
+
+    # report() scans the disk, so save after it or the index misses this scan
+    report = cache.report()
+    if args.command == "stats":
+        cache.save()
+    print(f"{report['segments']} segments, {format_size(report['bytes'])}")
+    print(f"hit rate {report['hit_rate']:.1%} ({report['hits']} hits, {report['misses']} misses)")
+    print(f"reclaimed {format_size(report['bytes_reclaimed'])} in total "
+          f"({report['evicted']} evicted, {report['orphans_removed']} orphaned scenes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import numpy as np
+from dataclasses import dataclass
+
+
+# Activation functions the scene knows how to draw: function, on-screen
+# formula and the y_range used for its Axes.
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def tanh(x):
+    return np.tanh(x)
+
+
+def relu(x):
+    return np.maximum(x, 0)
+
+
+ACTIVATIONS = {
+    "sigmoid": (sigmoid, "σ(x) = 1 / (1 + e^(-x))", [0, 1, 0.2]),
+    "tanh": (tanh, "tanh(x) = (eˣ - e⁻ˣ) / (eˣ + e⁻ˣ)", [-1, 1, 0.5]),
+    "relu": (relu, "ReLU(x) = max(0, x)", [0, 3, 1]),
+}
+
+# Derivatives written in terms of the activation a = f(z), for backprop
+DERIVATIVES = {
+    "sigmoid": lambda a: a * (1 - a),
+    "tanh": lambda a: 1 - a ** 2,
+    "relu": lambda a: (a > 0).astype(float),
+}
+
+
+@dataclass
+class NetworkSpec:
+    """Everything the forward-propagation scene needs to know about a network.
+
+    weights[l] has shape (layer_sizes[l + 1], layer_sizes[l]), so row j holds
+    the incoming weights of node j in the next layer. biases[l] has one entry
+    per node of layer l + 1.
+    """
+    layer_sizes: list
+    weights: list
+    biases: list
+    inputs: np.ndarray
+    activation: str = "sigmoid"
+    # Activations are rounded to this many decimals before feeding the next
+    # layer, so the arithmetic shown on screen adds up. None keeps full precision.
+    decimals: int = 2
+
+    def __post_init__(self):
+        self.layer_sizes = [int(n) for n in self.layer_sizes]
+        self.weights = [np.asarray(w, dtype=float) for w in self.weights]
+        self.biases = [np.asarray(b, dtype=float) for b in self.biases]
+        self.inputs = np.asarray(self.inputs, dtype=float)
+
+        if len(self.layer_sizes) < 2:
+            raise ValueError("a network needs at least an input and an output layer")
+        if len(self.weights) != len(self.layer_sizes) - 1 or len(self.biases) != len(self.weights):
+            raise ValueError("expected one weight matrix and bias vector per layer pair")
+        for l, (w, b) in enumerate(zip(self.weights, self.biases)):
+            shape = (self.layer_sizes[l + 1], self.layer_sizes[l])
+            if w.shape != shape:
+                raise ValueError(f"weights[{l}] has shape {w.shape}, expected {shape}")
+            if b.shape != (shape[0],):
+                raise ValueError(f"biases[{l}] has shape {b.shape}, expected {(shape[0],)}")
+        if self.inputs.shape[-1] != self.layer_sizes[0]:
+            raise ValueError(f"inputs have {self.inputs.shape[-1]} features, expected {self.layer_sizes[0]}")
+        if self.activation not in ACTIVATIONS:
+            raise ValueError(f"unknown activation {self.activation!r}, choose from {sorted(ACTIVATIONS)}")
+
+    @classmethod
+    def random(cls, layer_sizes, seed=0, activation="sigmoid", decimals=2):
+        # Small weights keep the printed numbers short and the activations
+        # away from saturation.
+        rng = np.random.default_rng(seed)
+        weights = [np.round(rng.uniform(-1, 1, (n_out, n_in)), 1)
+                   for n_in, n_out in zip(layer_sizes[:-1], layer_sizes[1:])]
+        biases = [np.round(rng.uniform(-0.5, 0.5, n_out), 1) for n_out in layer_sizes[1:]]
+        inputs = np.round(rng.uniform(0, 1, layer_sizes[0]), 1)
+        return cls(layer_sizes, weights, biases, inputs, activation, decimals)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        return {
+            "layer_sizes": list(self.layer_sizes),
+            "weights": [w.tolist() for w in self.weights],
+            "biases": [b.tolist() for b in self.biases],
+            "inputs": self.inputs.tolist(),
+            "activation": self.activation,
+            "decimals": self.decimals,
+        }
+
+
+# The 3-3-1 network the original video was scripted around.
+DEFAULT_SPEC = NetworkSpec(
+    layer_sizes=[3, 3, 1],
+    weights=[
+        [[-0.6, -0.4, 0.1],
+         [0.8, 0.9, 0.5],
+         [0.2, 0.4, -0.3]],
+        [[0.9, -0.5, 0.7]],
+    ],
+    biases=[[-0.05, 0.3, -0.1], [0.2]],
+    inputs=[0.5, 0.8, 0.2],
+)
+
+
+def forward(spec, inputs=None):
+    """Run the whole network in one pass.
+
+    inputs defaults to spec.inputs and may be a single vector or a
+    (batch, n_inputs) matrix. Returns (zs, activations): zs[l] are the
+    pre-activations of layer l + 1, activations[0] is the input itself.
+    """
+    fn = ACTIVATIONS[spec.activation][0]
+    a = np.asarray(spec.inputs if inputs is None else inputs, dtype=float)
+    zs, activations = [], [a]
+    for w, b in zip(spec.weights, spec.biases):
+        z = a @ w.T + b
+        a = fn(z)
+        if spec.decimals is not None:
+            a = np.round(a, spec.decimals)
+        zs.append(z)
+        activations.append(a)
+    return zs, activations
+
+
+def minibatch(spec, batch_size, seed=0):
+    """(batch_size, n_inputs) random inputs; the first sample is spec.inputs."""
+    rng = np.random.default_rng(seed)
+    batch = rng.uniform(0, 1, (batch_size, spec.layer_sizes[0]))
+    if spec.decimals is not None:
+        batch = np.round(batch, spec.decimals)
+    batch[0] = np.reshape(spec.inputs, (-1, spec.layer_sizes[0]))[0]
+    return batch
+
+
+
+@dataclass
+class TrainingStep:
+    """What train_steps() yields for every step.
+
+    The arrays are buffers the generator reuses: they are only valid until
+    the next step, so copy whatever has to outlive it. activations and
+    deltas (dloss/dz of layer l + 1) have one row per sample; weights and
+    biases are the ones that produced them, updated right after.
+    """
+    step: int
+    loss: float
+    weights: list
+    biases: list
+    activations: list
+    deltas: list
+
+
+def train_steps(spec, inputs, targets, learning_rate=0.5, steps=None):
+    """Full-batch gradient descent on the mean squared error, one step per item.
+
+    Starts from a copy of spec's weights and runs forever when steps is None.
+    Activations are not rounded to spec.decimals while training. Memory use
+    doesn't depend on the number of steps: every buffer is allocated once.
+    """
+    fn = ACTIVATIONS[spec.activation][0]
+    derivative = DERIVATIVES[spec.activation]
+    inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+    targets = np.asarray(targets, dtype=float).reshape(len(inputs), -1)
+    weights = [w.copy() for w in spec.weights]
+    biases = [b.copy() for b in spec.biases]
+    activations = [inputs] + [np.empty((len(inputs), n)) for n in spec.layer_sizes[1:]]
+    deltas = [np.empty_like(a) for a in activations[1:]]
+    gradients = [np.empty_like(w) for w in weights]
+    snapshot = TrainingStep(0, float("nan"), weights, biases, activations, deltas)
+
+    step = 0
+    while steps is None or step < steps:
+        for l, (w, b) in enumerate(zip(weights, biases)):
+            z = np.matmul(activations[l], w.T, out=activations[l + 1])
+            z += b
+            activations[l + 1][:] = fn(z)
+
+        error = activations[-1] - targets
+        snapshot.step = step
+        snapshot.loss = float(np.mean(error ** 2))
+        np.multiply(error, 2 / error.size, out=deltas[-1])
+        deltas[-1] *= derivative(activations[-1])
+        for l in range(len(weights) - 1, -1, -1):
+            np.matmul(deltas[l].T, activations[l], out=gradients[l])
+            if l:
+                np.matmul(deltas[l], weights[l], out=deltas[l - 1])
+                deltas[l - 1] *= derivative(activations[l])
+        yield snapshot
+
+        for w, b, gradient, delta in zip(weights, biases, gradients, deltas):
+            w -= learning_rate * gradient
+            b -= learning_rate * delta.sum(axis=0)
+        step += 1
+
+# Layout. The scene is drawn on a (0, 100) x (0, 100) grid with y pointing down.
+def grid_to_screen(points):
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    screen = np.zeros((len(points), 3))
+    screen[:, 0] = (points[:, 0] - 50) * 0.14
+    screen[:, 1] = (50 - points[:, 1]) * 0.08
+    return screen
+
+
+def layer_positions(layer_sizes, x_range=(15, 85), y_range=(20, 80), max_spacing=20):
+    """Grid coordinates of every node, one (n, 2) array per layer."""
+    xs = np.linspace(x_range[0], x_range[1], len(layer_sizes))
+    y_center = (y_range[0] + y_range[1]) / 2
+    positions = []
+    for x, n in zip(xs, layer_sizes):
+        spacing = min(max_spacing, (y_range[1] - y_range[0]) / max(n - 1, 1))
+        ys = y_center + spacing * (np.arange(n) - (n - 1) / 2)
+        positions.append(np.column_stack([np.full(n, x), ys]))
+    return positions
+
+
+def node_radius(layer_sizes, y_range=(20, 80), max_radius=0.25):
+    # Shrink the circles once the tallest column gets too dense for the
+    # default radius, keeping a gap between neighbours.
+    n = max(layer_sizes)
+    spacing = min(20, (y_range[1] - y_range[0]) / max(n - 1, 1)) * 0.08
+    return min(max_radius, 0.4 * spacing)
+
+
+def edge_endpoints(src, dst):
+    """Start and end points of every src -> dst edge, ordered [i][j] (src-major)."""
+    starts = np.repeat(src, len(dst), axis=0)
+    ends = np.tile(dst, (len(src), 1))
+    return starts, ends
+
+
+def edge_label_anchors(starts, ends, offset=0.15):
+    """Label centers just above each edge and the angle to rotate them by."""
+    d = ends - starts
+    angles = np.arctan2(d[:, 1], d[:, 0])
+    normals = np.column_stack([-np.sin(angles), np.cos(angles), np.zeros(len(angles))])
+    return (starts + ends) / 2 + offset * normals, angles
+
+
+def rotated_boxes(centers, angles, sizes):
+    """Axes (n, 2, 2) and half extents (n, 2) of rotated (width, height) boxes."""
+    cos, sin = np.cos(angles), np.sin(angles)
+    axes = np.stack([np.column_stack([cos, sin]), np.column_stack([-sin, cos])], axis=1)
+    return axes, np.asarray(sizes, dtype=float) / 2
+
+
+def boxes_intersect(centers, axes, half, other_centers, other_axes, other_halves):
+    """(k, m) overlaps of k equal oriented boxes at `centers` with m others.
+
+    Separating axis test: two rectangles are disjoint if their projections
+    on one of the four edge directions don't overlap.
+    """
+    m = len(other_centers)
+    test_axes = np.concatenate([np.broadcast_to(axes, (m, 2, 2)), other_axes], axis=1)
+    r_self = np.abs(test_axes @ axes.T) @ half
+    r_other = (np.abs(test_axes @ other_axes.transpose(0, 2, 1)) * other_halves[:, None, :]).sum(-1)
+    offsets = other_centers[:, :, None] - centers.T[None]
+    d = np.abs(test_axes @ offsets)
+    return np.all(d < (r_self + r_other)[:, :, None], axis=1).T
+
+
+class SpatialGrid:
+    """Uniform grid over 2D oriented boxes, so overlap queries only look at neighbours."""
+
+    def __init__(self, cell_size, capacity):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.size = 0
+        self.centers = np.empty((capacity, 2))
+        self.axes = np.empty((capacity, 2, 2))
+        self.halves = np.empty((capacity, 2))
+
+    def _cells(self, centers, axes, half):
+        # Cells touched by the axis-aligned bounds of the boxes
+        extent = np.abs(axes.T) @ half
+        lo = np.floor((centers.min(axis=0) - extent) / self.cell_size).astype(int)
+        hi = np.floor((centers.max(axis=0) + extent) / self.cell_size).astype(int)
+        return [(i, j) for i in range(lo[0], hi[0] + 1) for j in range(lo[1], hi[1] + 1)]
+
+    def overlaps(self, centers, axes, half):
+        """Number of stored boxes each of the (k, 2) candidate boxes overlaps."""
+        near = {k for cell in self._cells(centers, axes, half) for k in self.cells.get(cell, ())}
+        if not near:
+            return np.zeros(len(centers), dtype=int)
+        near = np.fromiter(near, dtype=int, count=len(near))
+        hits = boxes_intersect(centers, axes, half, self.centers[near], self.axes[near], self.halves[near])
+        return hits.sum(axis=1)
+
+    def insert(self, center, axes, half):
+        k = self.size
+        self.centers[k] = center
+        self.axes[k] = axes
+        self.halves[k] = half
+        self.size += 1
+        for cell in self._cells(center[None], axes, half):
+            self.cells.setdefault(cell, []).append(k)
+
+
+def layout_edge_labels(
+    starts,
+    ends,
+    sizes,
+    offset=0.15,
+    positions=(0.5, 0.4, 0.6, 0.3, 0.7),
+    obstacles=None,
+    padding=0.03,
+):
+    """Place one label per edge, parallel to it, without labels overlapping.
+
+    Candidate centers (every fraction in `positions` along the edge, first
+    above and then below it) are computed for all edges at once; each label
+    then takes its first candidate that doesn't overlap a label placed before
+    it or an obstacle, checked against a spatial grid. `sizes` are the
+    (width, height) of the unrotated labels, `obstacles` optional
+    (centers, sizes) of axis-aligned boxes to keep clear of (e.g. nodes).
+    Labels with no free spot get the candidate with the fewest overlaps and
+    are not avoided by later labels.
+
+    Returns anchors (n, 3), angles (n,) and a boolean array of the labels
+    placed without overlap.
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    n = len(starts)
+    sizes = np.asarray(sizes, dtype=float).reshape(n, 2) + 2 * padding
+    d = ends - starts
+    angles = np.arctan2(d[:, 1], d[:, 0])
+    normals = np.column_stack([-np.sin(angles), np.cos(angles), np.zeros(n)])
+    t = np.asarray(positions, dtype=float)[None, None, :, None]
+    sides = np.array([1.0, -1.0])[None, :, None, None]
+    candidates = starts[:, None, None] + t * d[:, None, None] + sides * offset * normals[:, None, None]
+    candidates = candidates.reshape(n, -1, 3)
+    axes, halves = rotated_boxes(candidates[:, 0, :2], angles, sizes)
+
+    if obstacles is None:
+        obstacles = (np.zeros((0, 3)), np.zeros((0, 2)))
+    obstacle_centers, obstacle_sizes = (np.asarray(a, dtype=float) for a in obstacles)
+    grid = SpatialGrid(max(float(sizes.max()), 1e-6), n + len(obstacle_centers))
+    for center, size in zip(obstacle_centers[:, :2], obstacle_sizes):
+        grid.insert(center, np.eye(2), size / 2)
+
+    choice = np.zeros(n, dtype=int)
+    placed = np.zeros(n, dtype=bool)
+    for i in range(n):
+        # All candidates of a label are tested in one go; take the first free one
+        hits = grid.overlaps(candidates[i, :, :2], axes[i], halves[i])
+        free = np.flatnonzero(hits == 0)
+        choice[i] = free[0] if len(free) else np.argmin(hits)
+        placed[i] = len(free) > 0
+        # Labels that don't fit are left out of the grid, so a crowded
+        # region doesn't get slower to search for every later label
+        if placed[i]:
+            grid.insert(candidates[i, choice[i], :2], axes[i], halves[i])
+    return candidates[np.arange(n), choice], angles, placed
+
+
+# Formatting of the numbers shown on screen.
+SUBSCRIPTS = str.maketrans("0123456789-", "₀₁₂₃₄₅₆₇₈₉₋")
+
+
+def subscript(*indices):
+    parts = [str(i).translate(SUBSCRIPTS) for i in indices]
+    # Multi-digit indices are ambiguous without a separator (w₁₁₂).
+    return ("," if any(len(p) > 1 for p in parts) else "").join(parts)
+
+
+def format_value(value, decimals=3):
+    text = f"{value:.{decimals}f}".rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def format_signed(value, decimals=3):
+    # Negative numbers are wrapped in parentheses inside sums: 0.36 + (-0.1)
+    text = format_value(value, decimals)
+    return f"({text})" if text.startswith("-") else text
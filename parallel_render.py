@@ -0,0 +1,112 @@
+"""Render the sections of a scene in parallel and join them without re-encoding.
+
+Each section is rendered by its own manim process with -n first,last: manim
+runs construct() from the top but skips every play() before the section, so
+the section starts from exactly the scene state it would have had in a serial
+render. The per-section movies share codec settings, so ffmpeg's concat
+demuxer can join them with a stream copy.
+
+    python parallel_render.py manime.py ForwardPropagationDemo -q k -j 4
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from manim import config
+from manim.constants import QUALITIES
+
+from scene_base import QUALITY_FLAGS, discover_sections, load_scene_class
+
+
+def video_dir(media_dir, module, quality):
+    q = QUALITIES[QUALITY_FLAGS[quality]]
+    return Path(media_dir) / "videos" / module / f"{q['pixel_height']}p{q['frame_rate']}"
+
+
+def render_section(file, scene, quality, first, last, output, media_dir, extra_args=(), workdir=None):
+    """Render plays first..last to <video dir>/<output>.mp4 and return the seconds taken.
+
+    manim keys its partial movie directory and file list on the scene name,
+    not on -o, so every worker renders into its own media directory
+    (workdir, by default <media_dir>/sections/<output>). It stays in place
+    between runs, so unchanged plays come from that worker's partial cache.
+    """
+    workdir = Path(workdir or Path(media_dir) / "sections" / output)
+    command = [
+        sys.executable, "-m", "manim", "render", f"-q{quality}",
+        "-n", f"{first},{last}", "-o", output, "--media_dir", str(workdir),
+        *extra_args, str(file), scene,
+    ]
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"rendering {output} failed:\n{result.stderr[-2000:]}")
+    out_dir = video_dir(media_dir, Path(file).stem, quality)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    os.replace(video_dir(workdir, Path(file).stem, quality) / f"{output}.mp4", out_dir / f"{output}.mp4")
+    return time.perf_counter() - start
+
+
+def concat(movies, output):
+    """Join movies with identical codec settings via a stream copy."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found on PATH")
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for movie in movies:
+            listing.write(f"file '{Path(movie).resolve().as_posix()}'\n")
+    try:
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+             "-i", listing.name, "-c", "copy", str(output)],
+            check=True,
+        )
+    finally:
+        os.unlink(listing.name)
+
+
+def parallel_render(file, scene, quality="l", jobs=None, media_dir="media", extra_args=()):
+    file = Path(file)
+    scene_class = load_scene_class(file, scene)
+    sections = discover_sections(scene_class, quality)
+    out_dir = video_dir(media_dir, file.stem, quality)
+    outputs = [f"{scene}_section{i:02d}" for i in range(len(sections))]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(render_section, file, scene, quality, first, last, output, media_dir, extra_args)
+            for (name, first, last), output in zip(sections, outputs)
+        ]
+        for (name, first, last), future in zip(sections, futures):
+            print(f"{name}: plays {first}-{last} rendered in {future.result():.1f}s")
+
+    movies = [out_dir / f"{output}.mp4" for output in outputs]
+    final = out_dir / f"{scene}.mp4"
+    concat(movies, final)
+    for movie in movies:
+        movie.unlink()
+    print(f"{final} written in {time.perf_counter() - start:.1f}s with {len(sections)} sections")
+    return final
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render scene sections in parallel.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--media_dir", default=config.media_dir)
+    args, extra = parser.parse_known_args(argv)
+    # Anything we don't know about is passed through to manim
+    parallel_render(args.file, args.scene, args.quality, args.jobs, args.media_dir, extra)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Per-play() profiling for scenes, exported as a Chrome trace.
+
+Scenes that inherit ProfiledScene record one entry per play() call when the
+MANIM_PROFILE environment variable names an output file:
+
+    MANIM_PROFILE=trace.json manim -ql manime.py ForwardPropagationDemo
+
+Each entry has the section label, the construct() line that made the call,
+wall time, frames written, time spent encoding, the number of animations and
+live mobjects and the growth of peak RSS. With a frame queue
+(PipelinedScene) encoding runs on its own thread: the encode column is the
+encoder thread's work done during the play and a separate hand-off column
+is what the play itself spent putting frames in the queue. The time
+between two plays (where Text, Axes and friends get built) is recorded as a
+separate "build" span. Open the JSON in chrome://tracing or ui.perfetto.dev;
+a summary of the slowest calls is logged at the end of the render.
+"""
+import json
+import os
+import sys
+import time
+
+from manim import *
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Scene mixin methods that forward to play() on behalf of the real caller;
+# a coalesce() block flushes from its generator when the with-block ends
+WRAPPER_FUNCTIONS = {"play", "flush_plays", "coalesce"}
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def written_frames(args, kwargs):
+    """Frames a write_frame(frame, num_frames=1) call puts in the movie."""
+    # A frozen wait() writes one image many times in a single call
+    return kwargs.get("num_frames", args[1] if len(args) > 1 else 1)
+
+
+class PlayProfiler:
+    def __init__(self):
+        self.records = []
+        self.start = time.perf_counter()
+        self.last_end = self.start
+        self.frames = 0
+        self.encode_time = 0.0
+        self.handoff_time = 0.0
+        self.pipelined = False
+
+    def wrap_writer(self, file_writer, pipeline=None):
+        # Count frames and time spent in write_frame; behind a frame queue
+        # that is only the hand-off, the encoding is timed on its thread
+        write_frame = file_writer.write_frame
+
+        def timed_write_frame(*args, **kwargs):
+            start = time.perf_counter()
+            write_frame(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            self.handoff_time += elapsed
+            if pipeline is None:
+                self.encode_time += elapsed
+            self.frames += written_frames(args, kwargs)
+
+        file_writer.write_frame = timed_write_frame
+        if pipeline is None:
+            return
+        self.pipelined = True
+        write = pipeline.write
+
+        def timed_write(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return write(*args, **kwargs)
+            finally:
+                self.encode_time += time.perf_counter() - start
+
+        pipeline.write = timed_write
+
+    def record(self, section, caller, n_animations, n_mobjects, begin, end, frames, encode, handoff,
+               rss_before, rss_after):
+        self.records.append({
+            "section": section,
+            "caller": caller,
+            "build_start": self.last_end - self.start,
+            "start": begin - self.start,
+            "wall": end - begin,
+            "frames": frames,
+            "encode": encode,
+            "handoff": handoff,
+            "animations": n_animations,
+            "mobjects": n_mobjects,
+            "rss_delta": None if rss_before is None else rss_after - rss_before,
+        })
+        self.last_end = end
+
+    def chrome_trace(self):
+        events = []
+        pid = os.getpid()
+        for i, r in enumerate(self.records):
+            name = f"play {i} ({r['caller']})"
+            events.append({
+                "name": f"build before {name}", "cat": "build", "ph": "X", "pid": pid, "tid": 1,
+                "ts": r["build_start"] * 1e6, "dur": (r["start"] - r["build_start"]) * 1e6,
+            })
+            events.append({
+                "name": name, "cat": "play", "ph": "X", "pid": pid, "tid": 2,
+                "ts": r["start"] * 1e6, "dur": r["wall"] * 1e6,
+                "args": {k: v for k, v in r.items() if k not in ("build_start", "start")},
+            })
+        # One span per section on its own row
+        sections = {}
+        for r in self.records:
+            first, last = sections.get(r["section"], (r["build_start"], 0))
+            sections[r["section"]] = (first, max(last, r["start"] + r["wall"]))
+        for name, (first, last) in sections.items():
+            events.append({
+                "name": str(name), "cat": "section", "ph": "X", "pid": pid, "tid": 0,
+                "ts": first * 1e6, "dur": (last - first) * 1e6,
+            })
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": label}}
+            for tid, label in [(0, "sections"), (1, "scene building"), (2, "play")]
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self, top=10):
+        total = sum(r["wall"] for r in self.records)
+        handoff = f" {'hand s':>7}" if self.pipelined else ""
+        lines = [f"{'wall s':>8} {'share':>6} {'frames':>6} {'enc s':>7}{handoff} {'anims':>5} {'mobs':>5}  call"]
+        for r in sorted(self.records, key=lambda r: r["wall"], reverse=True)[:top]:
+            handoff = f" {r['handoff']:7.3f}" if self.pipelined else ""
+            lines.append(
+                f"{r['wall']:8.3f} {r['wall'] / total if total else 0:6.1%} {r['frames']:6d} "
+                f"{r['encode']:7.3f}{handoff} {r['animations']:5d} {r['mobjects']:5d}  {r['section']} / {r['caller']}"
+            )
+        encoding = f"{self.encode_time:.2f}s encoding"
+        if self.pipelined:
+            encoding += f" on the encoder thread, {self.handoff_time:.2f}s handing frames over"
+        lines.append(f"{len(self.records)} plays, {total:.2f}s in play(), {encoding}, {self.frames} frames")
+        return "\n".join(lines)
+
+
+class ProfiledScene(Scene):
+    """Scene that profiles every play() call when MANIM_PROFILE is set."""
+
+    def setup(self):
+        super().setup()
+        path = os.environ.get("MANIM_PROFILE")
+        self.profiler = PlayProfiler() if path else None
+        if self.profiler:
+            # PipelinedScene sets up its queue first (it comes later in the MRO)
+            self.profiler.wrap_writer(self.renderer.file_writer, getattr(self, "frame_pipeline", None))
+
+    def play(self, *args, **kwargs):
+        profiler = getattr(self, "profiler", None)
+        if profiler is None:
+            return super().play(*args, **kwargs)
+
+        # Attribute the call to scene code, not to play() wrappers of other
+        # mixins or the coalescing context manager
+        frame = sys._getframe(1)
+        while frame.f_back and (
+            frame.f_code.co_name in WRAPPER_FUNCTIONS or frame.f_code.co_filename.endswith("contextlib.py")
+        ):
+            frame = frame.f_back
+        caller = f"{frame.f_code.co_name}:{frame.f_lineno}"
+        starts = getattr(self, "section_starts", None)
+        section = starts[-1][0] if starts else None
+        frames, encode, handoff = profiler.frames, profiler.encode_time, profiler.handoff_time
+        rss = peak_rss()
+        begin = time.perf_counter()
+        super().play(*args, **kwargs)
+        end = time.perf_counter()
+        profiler.record(
+            section, caller, len(args), len(self.get_mobject_family_members()),
+            begin, end, profiler.frames - frames, profiler.encode_time - encode,
+            profiler.handoff_time - handoff, rss, peak_rss(),
+        )
+
+    def tear_down(self):
+        super().tear_down()
+        if getattr(self, "profiler", None) is None:
+            return
+        path = os.environ["MANIM_PROFILE"]
+        with open(path, "w") as f:
+            json.dump(self.profiler.chrome_trace(), f)
+        logger.info("Play profile:\n%s", self.profiler.summary())
+        logger.info("Chrome trace written to %s", path)
@@ -0,0 +1,468 @@
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from manim import *
+from manim.constants import QUALITIES
+from manim.utils.iterables import list_update
+import numpy as np
+
+from parallel_render import QUALITY_FLAGS
+
+
+def bounding_box(mobjects, margin=0.0):
+    """(min, max) corners of everything in `mobjects`, None if nothing has points."""
+    points = [m.points for mob in mobjects for m in mob.get_family() if len(m.points)]
+    if not points:
+        return None
+    points = np.concatenate(points)
+    return points.min(axis=0) - margin, points.max(axis=0) + margin
+
+
+def boxes_overlap(a, b):
+    return bool(np.all(a[0][:2] <= b[1][:2]) and np.all(b[0][:2] <= a[1][:2]))
+
+
+def animation_extent(animation, margin=0.1):
+    """Region an animation can touch: its mobject now, plus target and path if any."""
+    mobjects = [animation.mobject]
+    for name in ("target_mobject", "path"):
+        other = getattr(animation, name, None)
+        if isinstance(other, Mobject):
+            mobjects.append(other)
+    return bounding_box(mobjects, margin)
+
+
+class FrozenBackgroundScene(Scene):
+    """Rasterize what an animation doesn't touch once, and only redraw what moves.
+
+    manim already draws the static part of each play() into a background
+    image, but it treats every mobject added after the first animated one as
+    moving, and it re-rasterizes the background at the start of every play.
+    Here only the animated mobjects (plus anything with updaters, foreground
+    mobjects, and later mobjects that overlap an animation and so have to be
+    drawn on top of it) are redrawn per frame, and the background image is
+    reused across plays until the static set or its appearance changes.
+    """
+
+    frozen_background = True
+
+    def setup(self):
+        super().setup()
+        self.background_hits = 0
+        self.background_misses = 0
+        self._background_key = None
+        self._background_image = None
+        if self.frozen_background and hasattr(self.renderer, "save_static_frame_data"):
+            save_static_frame_data = self.renderer.save_static_frame_data
+
+            def cached_static_frame_data(scene, static_mobjects):
+                key = self.background_key(static_mobjects)
+                if key == self._background_key and self._background_image is not None:
+                    self.background_hits += 1
+                    self.renderer.static_image = self._background_image
+                    return self._background_image
+                self.background_misses += 1
+                image = save_static_frame_data(scene, static_mobjects)
+                self._background_key = key
+                # The renderer keeps drawing into its pixel array, so hold on to a copy
+                self._background_image = None if image is None else np.array(image)
+                return image
+
+            self.renderer.save_static_frame_data = cached_static_frame_data
+
+    def background_key(self, static_mobjects):
+        # Identity and appearance of everything in the background; any change
+        # to points, colors, widths, image pixels or draw order invalidates the buffer
+        camera = self.renderer.camera
+        return hash((
+            camera.pixel_array.shape,
+            str(camera.background_color),
+            tuple(
+                (
+                    id(m),
+                    hash(m.points.tobytes()),
+                    hash(m.get_stroke_rgbas().tobytes()) if isinstance(m, VMobject) else None,
+                    hash(m.get_fill_rgbas().tobytes()) if isinstance(m, VMobject) else None,
+                    m.get_stroke_width() if isinstance(m, VMobject) else None,
+                    hash(m.pixel_array.tobytes()) if isinstance(m, AbstractImageMobject) else None,
+                    getattr(m, "z_index", 0),
+                )
+                for m in static_mobjects
+            ),
+        ))
+
+    def get_moving_mobjects(self, *animations):
+        if not self.frozen_background:
+            return super().get_moving_mobjects(*animations)
+
+        mobjects = self.get_mobject_family_members()
+        animated = {id(m) for animation in animations for m in animation.mobject.get_family()}
+        foreground = {id(m) for mob in self.foreground_mobjects for m in mob.get_family()}
+        moving = [
+            id(m) in animated or id(m) in foreground or len(m.updaters) > 0
+            for m in mobjects
+        ]
+        if not any(moving):
+            return []
+
+        # Static mobjects drawn after a moving one must be redrawn if they
+        # could end up under it, otherwise draw order would change
+        extents = [animation_extent(animation) for animation in animations]
+        first = moving.index(True)
+        for i in range(first + 1, len(mobjects)):
+            if moving[i] or not len(mobjects[i].points):
+                continue
+            box = bounding_box([mobjects[i]])
+            if any(extent is None or boxes_overlap(box, extent) for extent in extents):
+                moving[i] = True
+        return [m for m, is_moving in zip(mobjects, moving) if is_moving]
+
+
+def parse_output(value):
+    """Quality flag ('l' .. 'k') or 'WIDTHxHEIGHT@FPS' -> (width, height, fps)."""
+    value = value.strip()
+    if value in QUALITY_FLAGS:
+        q = QUALITIES[QUALITY_FLAGS[value]]
+        return q["pixel_width"], q["pixel_height"], q["frame_rate"]
+    match = re.fullmatch(r"(\d+)x(\d+)@(\d+(?:\.\d+)?)", value)
+    if match is None:
+        raise ValueError(f"bad output {value!r}, expected a quality flag or WIDTHxHEIGHT@FPS")
+    return int(match[1]), int(match[2]), float(match[3])
+
+
+class FrameEncoder:
+    """ffmpeg process encoding raw RGBA frames written to its stdin."""
+
+    def __init__(self, path, width, height, fps):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found on PATH")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            [
+                ffmpeg, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "-",
+                "-an", "-vcodec", "libx264", "-pix_fmt", "yuv420p", str(self.path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, frame):
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed writing {self.path}")
+
+
+class ExtraOutput:
+    def __init__(self, width, height, fps, step, path):
+        self.camera = Camera(pixel_width=width, pixel_height=height, frame_rate=fps)
+        self.encoder = FrameEncoder(path, width, height, fps)
+        # Keep one frame out of every `step` frames of the main output
+        self.step = step
+        self.static_image = None
+        self.main_frames = 0
+        self.frames = 0
+
+    def capture(self, scene, mobjects, include_submobjects=True, background=True):
+        # Same drawing rules as the main renderer's update_frame
+        if not mobjects:
+            mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+        if background and self.static_image is not None:
+            self.camera.set_frame_to_background(self.static_image)
+        else:
+            self.camera.reset()
+        self.camera.capture_mobjects(mobjects, include_submobjects=include_submobjects)
+
+
+class MultiResolutionScene(Scene):
+    """Write several resolutions from a single run of construct().
+
+    extra_outputs (or MANIM_EXTRA_OUTPUTS="l,1920x1080@30") lists quality
+    flags or WIDTHxHEIGHT@FPS sizes to write next to the main movie, in the
+    directory a normal render at that size would use. Text layout, Axes and
+    paths are built once; each extra output only adds a camera, which
+    rasterizes just the frames it keeps, and an ffmpeg process. The scene is
+    stepped at the main frame rate, so extra frame rates have to divide it:
+    render the main movie at the highest rate (e.g. -qk with "l,m").
+
+    Extra outputs only get the frames this run draws, so manim's partial
+    movie cache is turned off while they are written. Plays skipped with -n
+    or by --resume are missing from them, and a warning says so.
+    """
+
+    extra_outputs = ()
+
+    def setup(self):
+        super().setup()
+        self.outputs = []
+        names = os.environ.get("MANIM_EXTRA_OUTPUTS")
+        names = names.split(",") if names else self.extra_outputs
+        renderer = self.renderer
+        movie = getattr(renderer.file_writer, "movie_file_path", None)
+        if not names or movie is None or not hasattr(renderer, "update_frame"):
+            return
+
+        main_rate = renderer.camera.frame_rate
+        for name in names:
+            width, height, fps = parse_output(name)
+            step = main_rate / fps
+            if abs(step - round(step)) > 1e-6:
+                raise ValueError(f"{name}: {fps:g} fps does not divide the main frame rate {main_rate:g}")
+            path = Path(movie).parent.parent / f"{height}p{fps:g}" / Path(movie).name
+            self.outputs.append(ExtraOutput(width, height, fps, round(step), path))
+
+        # A play served from the cache draws no frames the extra cameras could keep
+        self._disable_caching = config.disable_caching
+        config.disable_caching = True
+        self.skipped_plays = 0
+        end_animation = renderer.file_writer.end_animation
+
+        def counting_end_animation(allow_write=False, *args, **kwargs):
+            if not allow_write:
+                self.skipped_plays += 1
+            return end_animation(allow_write, *args, **kwargs)
+
+        renderer.file_writer.end_animation = counting_end_animation
+        update_frame = renderer.update_frame
+        save_static_frame_data = renderer.save_static_frame_data
+        add_frame = renderer.add_frame
+
+        def update_frame_all(scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+            update_frame(scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+            # The extra cameras draw lazily in add_frame, only for frames they keep
+            self._pending_capture = (mobjects, include_submobjects, renderer.static_image is not None)
+
+        def save_static_frame_data_all(scene, static_mobjects):
+            image = save_static_frame_data(scene, static_mobjects)
+            for output in self.outputs:
+                output.capture(scene, static_mobjects, background=False)
+                output.static_image = np.array(output.camera.pixel_array)
+            return image
+
+        def add_frame_all(frame, num_frames=1):
+            add_frame(frame, num_frames)
+            if renderer.skip_animations:
+                return
+            mobjects, include_submobjects, background = self._pending_capture
+            for output in self.outputs:
+                start = output.main_frames
+                output.main_frames += num_frames
+                keep = -(-output.main_frames // output.step) - -(-start // output.step)
+                if keep <= 0:
+                    continue
+                output.capture(self, mobjects, include_submobjects, background)
+                for _ in range(keep):
+                    output.encoder.write(output.camera.pixel_array)
+                output.frames += keep
+
+        self._pending_capture = (None, True, False)
+        renderer.update_frame = update_frame_all
+        renderer.save_static_frame_data = save_static_frame_data_all
+        renderer.add_frame = add_frame_all
+
+    def tear_down(self):
+        super().tear_down()
+        if not self.outputs:
+            return
+        config.disable_caching = self._disable_caching
+        if self.skipped_plays or getattr(self, "resumed_from", None):
+            logger.warning(
+                "Extra outputs are incomplete: %d plays were skipped%s; render without -n/--resume for full movies",
+                self.skipped_plays, " and the render resumed from a checkpoint" if getattr(self, "resumed_from", None) else "",
+            )
+        for output in self.outputs:
+            output.encoder.close()
+            logger.info("Wrote %d frames to %s", output.frames, output.encoder.path)
+
+
+class FramePipeline:
+    """Hand frames to `write` on an encoder thread through a bounded queue.
+
+    Frames live in a small pool of recycled buffers (at most depth + 2 are
+    ever allocated). A caller that rasterizes straight into a buffer from
+    acquire() hands it over with put() without any copy; other frames are
+    copied into one. When every buffer is in flight the renderer waits
+    (render stall), and when the queue is empty the encoder waits (encoder
+    idle).
+    """
+
+    def __init__(self, write, depth=4):
+        self.write = write
+        self.depth = depth
+        self.queue = queue.Queue(maxsize=depth)
+        self.free = queue.Queue()
+        # Kept alive for good: their ids key the camera's cairo contexts
+        self.pooled = {}
+        self.buffers = 0
+        self.error = None
+        self.frames = 0
+        self.copies = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.render_stall = 0.0
+        self.encoder_idle = 0.0
+        self.encode_time = 0.0
+        self.thread = threading.Thread(target=self._run, name="frame-encoder", daemon=True)
+        self.thread.start()
+
+    def acquire(self, like):
+        """A recycled buffer shaped like `like`, waiting for one if all are in use."""
+        if self.free.empty() and self.buffers < self.depth + 2:
+            buffer = np.empty_like(like)
+            self.pooled[id(buffer)] = buffer
+            self.buffers += 1
+            return buffer
+        start = time.perf_counter()
+        buffer = self.free.get()
+        self.render_stall += time.perf_counter() - start
+        if buffer.shape != like.shape or buffer.dtype != like.dtype:
+            # Not pooled: it is dropped once written
+            return np.empty_like(like)
+        return buffer
+
+    def put(self, frame, *args, **kwargs):
+        self._check()
+        if not isinstance(frame, np.ndarray):
+            # Not a pixel buffer (OpenGL renderer): write it in order, synchronously
+            self.join()
+            return self.write(frame, *args, **kwargs)
+        if self.pooled.get(id(frame)) is frame:
+            buffer = frame
+        else:
+            buffer = self.acquire(frame)
+            np.copyto(buffer, frame)
+            self.copies += 1
+        depth = self.queue.qsize()
+        self.depth_total += depth
+        self.max_depth = max(self.max_depth, depth)
+        start = time.perf_counter()
+        self.queue.put((buffer, args, kwargs))
+        self.render_stall += time.perf_counter() - start
+        self.frames += 1
+
+    def _run(self):
+        while True:
+            start = time.perf_counter()
+            item = self.queue.get()
+            self.encoder_idle += time.perf_counter() - start
+            if item is None:
+                self.queue.task_done()
+                return
+            buffer, args, kwargs = item
+            try:
+                if self.error is None:
+                    start = time.perf_counter()
+                    self.write(buffer, *args, **kwargs)
+                    self.encode_time += time.perf_counter() - start
+            except BaseException as e:
+                self.error = e
+            finally:
+                if self.pooled.get(id(buffer)) is buffer:
+                    self.free.put(buffer)
+                self.queue.task_done()
+
+    def _check(self):
+        if self.error is not None:
+            raise RuntimeError("frame encoder failed") from self.error
+
+    def join(self):
+        """Wait until every queued frame has been written."""
+        self.queue.join()
+        self._check()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self._check()
+
+    def metrics(self):
+        return {
+            "frames": self.frames,
+            "depth": self.depth,
+            "buffers": self.buffers,
+            "copies": self.copies,
+            "mean_depth": self.depth_total / self.frames if self.frames else 0.0,
+            "max_depth": self.max_depth,
+            "render_stall": self.render_stall,
+            "encoder_idle": self.encoder_idle,
+            "encode_time": self.encode_time,
+        }
+
+
+class PipelinedScene(Scene):
+    """Rasterize the next frame while the previous one is being encoded.
+
+    Set frame_queue_depth (or MANIM_FRAME_QUEUE=8) to put a bounded queue
+    between the renderer and the file writer; 0 keeps the usual alternating
+    behaviour. The camera draws every frame straight into a pooled buffer
+    that goes to the encoder thread as is, instead of manim's copy per frame.
+    Each partial movie is drained before it is closed, so the output is
+    identical either way. manim versions whose file writer already encodes
+    on its own thread (0.19+) don't need this and the setting is ignored.
+    """
+
+    frame_queue_depth = 0
+
+    def setup(self):
+        super().setup()
+        self.frame_pipeline = None
+        depth = int(os.environ.get("MANIM_FRAME_QUEUE", self.frame_queue_depth))
+        renderer = self.renderer
+        writer = renderer.file_writer
+        if depth <= 0 or not hasattr(writer, "write_frame") or not hasattr(renderer, "render"):
+            return
+        if hasattr(writer, "listen_and_write") or hasattr(writer, "encode_and_write_frame"):
+            logger.info("This manim already encodes on a writer thread, frame queue not used")
+            return
+
+        self._write_frame = writer.write_frame
+        self._render = renderer.render
+        pipeline = FramePipeline(writer.write_frame, depth)
+        end_animation = writer.end_animation
+
+        def drained_end_animation(*args, **kwargs):
+            pipeline.join()
+            return end_animation(*args, **kwargs)
+
+        def pooled_render(scene, time, moving_mobjects):
+            # Same as CairoRenderer.render, minus the copy in get_frame()
+            renderer.update_frame(scene, moving_mobjects)
+            if renderer.skip_animations:
+                return
+            camera = renderer.camera
+            frame = camera.pixel_array
+            # update_frame always starts from the background, so the next
+            # frame can be drawn into any free buffer
+            camera.pixel_array = pipeline.acquire(frame)
+            renderer.add_frame(frame)
+
+        writer.write_frame = pipeline.put
+        writer.end_animation = drained_end_animation
+        renderer.render = pooled_render
+        self.frame_pipeline = pipeline
+
+    def tear_down(self):
+        super().tear_down()
+        pipeline = self.frame_pipeline
+        if pipeline is None:
+            return
+        pipeline.close()
+        # Anything written after this point (e.g. a last frame) goes straight through
+        self.renderer.file_writer.write_frame = self._write_frame
+        self.renderer.render = self._render
+        logger.info(
+            "Frame queue: %(frames)d frames (%(copies)d copied), depth %(max_depth)d/%(depth)d "
+            "(mean %(mean_depth).1f), render stalled %(render_stall).2fs, encoder idle %(encoder_idle).2fs, "
+            "encoding %(encode_time).2fs",
+            pipeline.metrics(),
+        )
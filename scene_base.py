@@ -0,0 +1,202 @@
+import ast
+import gc
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+from manim import *
+
+from mobjects import POOL, nbytes
+from profiling import peak_rss
+
+# manim's -q letters and the quality names config expects
+QUALITY_FLAGS = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def scene_state_hash(scene):
+    """Hash of everything on screen: geometry, style and draw order."""
+    digest = hashlib.sha256()
+    for mob in scene.get_mobject_family_members():
+        digest.update(type(mob).__name__.encode())
+        digest.update(mob.points.tobytes())
+        if isinstance(mob, VMobject):
+            digest.update(mob.get_stroke_rgbas().tobytes())
+            digest.update(mob.get_fill_rgbas().tobytes())
+            digest.update(repr(mob.get_stroke_width()).encode())
+        if isinstance(mob, AbstractImageMobject):
+            digest.update(mob.pixel_array.tobytes())
+        digest.update(repr(getattr(mob, "z_index", 0)).encode())
+    return digest.hexdigest()
+
+
+class SectionedScene(Scene):
+    """Scene whose timeline is split into named sections.
+
+    Calling section() starts a new manim section and records the number of
+    play() calls made so far, so tools can map each section to a range of
+    animation numbers (see parallel_render.py). With record_section_states
+    set, a hash of the on-screen state at each section start is kept too.
+    With MANIM_SECTION_LOG set, the section starts a render actually saw are
+    written to <media_dir>/<Scene>_sections.json, so tools can check them
+    against their dry run.
+    """
+
+    record_section_states = False
+
+    def setup(self):
+        super().setup()
+        self.section_starts = []
+        self.section_states = []
+
+    def section(self, name):
+        self.section_starts.append((name, self.renderer.num_plays))
+        if self.record_section_states:
+            self.section_states.append(scene_state_hash(self))
+        self.next_section(name)
+
+    def tear_down(self):
+        # Also reached when -n ends the scene early
+        if os.environ.get("MANIM_SECTION_LOG"):
+            path = Path(config.media_dir) / f"{type(self).__name__}_sections.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"sections": self.section_starts}))
+        super().tear_down()
+
+
+class LifecycleScene(SectionedScene):
+    """Scene that hands finished mobjects back to the pool and tracks memory.
+
+    Call release() on mobjects once they are off screen for good (faded out,
+    or Transform targets that were never added); they are removed from the
+    scene and recycled by the shared MobjectPool. At every section boundary
+    the number and size of live mobjects, on screen and in the whole
+    process, are recorded in self.lifecycle and logged at the end.
+    """
+
+    def setup(self):
+        super().setup()
+        self.lifecycle = []
+
+    def release(self, *mobjects):
+        self.remove(*mobjects)
+        POOL.release(*mobjects)
+
+    def section(self, name):
+        self.record_lifecycle()
+        super().section(name)
+
+    def record_lifecycle(self):
+        # Collect first so the counts show what is really kept alive
+        gc.collect()
+        live = [obj for obj in gc.get_objects() if isinstance(obj, Mobject)]
+        on_screen = self.get_mobject_family_members()
+        rss = peak_rss()
+        self.lifecycle.append({
+            "section": self.section_starts[-1][0] if self.section_starts else "Start",
+            "on_screen": len(on_screen),
+            "on_screen_bytes": nbytes(on_screen),
+            "live": len(live),
+            "live_bytes": nbytes(live),
+            "pooled": POOL.stats()["pooled"],
+            "peak_rss": rss,
+        })
+
+    def lifecycle_summary(self):
+        lines = [f"{'screen':>7} {'KB':>8} {'live':>7} {'KB':>8} {'pooled':>6} {'peak MB':>8}  section"]
+        for r in self.lifecycle:
+            peak = "" if r["peak_rss"] is None else f"{r['peak_rss'] / 2**20:.0f}"
+            lines.append(
+                f"{r['on_screen']:7d} {r['on_screen_bytes'] / 1024:8.0f} {r['live']:7d} "
+                f"{r['live_bytes'] / 1024:8.0f} {r['pooled']:6d} {peak:>8}  {r['section']}"
+            )
+        return "\n".join(lines)
+
+    def tear_down(self):
+        super().tear_down()
+        self.record_lifecycle()
+        logger.info("Mobjects at the end of each section:\n%s", self.lifecycle_summary())
+        logger.info("Mobject pool: %(created)d created, %(reused)d reused, %(released)d released", POOL.stats())
+
+
+def imported_names(path):
+    """Top-level module names a Python file imports."""
+    names = set()
+    for node in ast.walk(ast.parse(Path(path).read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def module_files(file):
+    """`file` and every sibling module it imports, directly or not, sorted."""
+    file = Path(file).resolve()
+    seen = {file.stem: file}
+    todo = [file]
+    while todo:
+        for name in imported_names(todo.pop()):
+            sibling = file.parent / f"{name}.py"
+            if name not in seen and sibling.exists():
+                seen[name] = sibling
+                todo.append(sibling)
+    return sorted(seen.values())
+
+
+def load_scene_class(file, name):
+    """Import `file` as a module and return its scene class `name`."""
+    file = Path(file).resolve()
+    # Scene modules import their helpers as siblings, like manim's own loader
+    if str(file.parent) not in sys.path:
+        sys.path.insert(0, str(file.parent))
+    spec = importlib.util.spec_from_file_location(file.stem, file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[file.stem] = module
+    spec.loader.exec_module(module)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise ValueError(f"{file.name} has no scene named {name!r}") from None
+
+
+def scan_sections(scene_class, record_states=False, quality="l"):
+    """Run construct without rendering and describe every section.
+
+    The scan runs at the frame rate of `quality`, the one being rendered:
+    with CoalescingScene the number of plays depends on it. Returns dicts with the section name, the first and last play number (as
+    manim's -n flag expects them; last < first for a section without plays)
+    and, with record_states, the state hash at the section start.
+    """
+    with tempconfig({"quality": QUALITY_FLAGS[quality], "dry_run": True}):
+        scene = scene_class(skip_animations=True)
+        scene.record_section_states = record_states
+        scene.render()
+    total = scene.renderer.num_plays
+    starts = list(scene.section_starts)
+    states = list(scene.section_states) or [None] * len(starts)
+    if not starts or starts[0][1] > 0:
+        starts.insert(0, ("Start", 0))
+        states.insert(0, None)
+    starts.append((None, total))
+    return [
+        {"name": name, "first": start, "last": end - 1, "state": state}
+        for (name, start), (_, end), state in zip(starts, starts[1:], states)
+    ]
+
+
+def discover_sections(scene_class, quality="l"):
+    """[(name, first_play, last_play)] of every section that has plays."""
+    return [
+        (section["name"], section["first"], section["last"])
+        for section in scan_sections(scene_class, quality=quality)
+        if section["last"] >= section["first"]
+    ]
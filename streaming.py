@@ -0,0 +1,150 @@
+"""Stream a render as HLS while it is still running.
+
+Scenes that inherit StreamingScene publish every partial movie file as soon as
+its play() has finished, when MANIM_STREAM is set (or stream_output is True):
+
+    MANIM_STREAM=1 manim -qk manime.py ForwardPropagationDemo
+
+Each segment is remuxed (stream copy, no re-encode) into an MPEG-TS chunk
+with timestamps continuing from the previous one, and appended to an event
+playlist next to the movie:
+
+    media/videos/manime/2160p60/stream/ForwardPropagationDemo/index.m3u8
+
+The playlist grows while rendering goes on and is closed with
+#EXT-X-ENDLIST at the end, so any HLS player (ffplay, VLC, Safari, hls.js)
+can start watching the first sections right away. Segments reused from
+manim's cache are published like freshly rendered ones; plays skipped with
+-n are not part of the stream.
+"""
+import json
+import math
+import os
+from fractions import Fraction
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from manim import *
+
+PLAYLIST_NAME = "index.m3u8"
+
+
+class HLSWriter:
+    def __init__(self, directory):
+        self.ffmpeg = shutil.which("ffmpeg")
+        self.ffprobe = shutil.which("ffprobe")
+        if self.ffmpeg is None or self.ffprobe is None:
+            raise RuntimeError("ffmpeg and ffprobe not found on PATH")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for old in self.directory.glob("*.ts"):
+            old.unlink()
+        self.segments = []
+        # Exact sum of frames / fps, so offsets never drift
+        self.offset = Fraction(0)
+        self.closed = False
+        # One worker keeps segments in order and off the render thread
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.futures = []
+        self.write_playlist()
+
+    def add(self, movie, title=""):
+        self.futures.append(self.pool.submit(self._add, Path(movie), title))
+
+    def duration(self, movie):
+        # Frames actually encoded, not the play's run_time: manim rounds
+        # every play to whole frames, and that would drift over the stream
+        result = subprocess.run(
+            [
+                self.ffprobe, "-v", "error", "-select_streams", "v:0", "-count_packets",
+                "-show_entries", "stream=nb_read_packets,avg_frame_rate", "-of", "json", str(movie),
+            ],
+            capture_output=True, text=True, check=True,
+        )
+        stream = json.loads(result.stdout)["streams"][0]
+        return int(stream["nb_read_packets"]) / Fraction(stream["avg_frame_rate"])
+
+    def _add(self, movie, title):
+        # Runs on the single worker, so offsets add up in segment order
+        duration = self.duration(movie)
+        offset = self.offset
+        self.offset += duration
+        duration = float(duration)
+        name = f"segment{len(self.segments):05d}.ts"
+        subprocess.run(
+            [
+                self.ffmpeg, "-y", "-loglevel", "error", "-i", str(movie),
+                "-c", "copy", "-bsf:v", "h264_mp4toannexb", "-output_ts_offset", f"{float(offset):.6f}",
+                "-f", "mpegts", str(self.directory / name),
+            ],
+            check=True,
+        )
+        self.segments.append((name, duration, title))
+        self.write_playlist()
+
+    def write_playlist(self):
+        target = max((math.ceil(d) for _, d, _ in self.segments), default=1)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            f"#EXT-X-TARGETDURATION:{max(target, 1)}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for name, duration, title in self.segments:
+            lines += [f"#EXTINF:{duration:.3f},{title}", name]
+        if self.closed:
+            lines.append("#EXT-X-ENDLIST")
+        # Players poll the playlist, so never let them see half of it
+        path = self.directory / PLAYLIST_NAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
+        self.closed = True
+        self.write_playlist()
+
+
+class StreamingScene(Scene):
+    """Publish each finished play() to a growing HLS playlist."""
+
+    stream_output = False
+
+    def setup(self):
+        super().setup()
+        self.stream = None
+        if not (os.environ.get("MANIM_STREAM") or self.stream_output):
+            return
+        writer = self.renderer.file_writer
+        movie = getattr(writer, "movie_file_path", None)
+        if movie is None or not hasattr(writer, "end_animation"):
+            return
+
+        self.stream = HLSWriter(Path(movie).parent / "stream" / Path(movie).stem)
+        published = len(writer.partial_movie_files)
+        end_animation = writer.end_animation
+
+        def publishing_end_animation(*args, **kwargs):
+            nonlocal published
+            result = end_animation(*args, **kwargs)
+            # New entries are this play's segment, freshly written or from the cache
+            for movie in writer.partial_movie_files[published:]:
+                if movie is not None and os.path.exists(movie):
+                    self.stream.add(movie, writer.sections[-1].name)
+            published = len(writer.partial_movie_files)
+            return result
+
+        writer.end_animation = publishing_end_animation
+        logger.info("Streaming to %s", self.stream.directory / PLAYLIST_NAME)
+
+    def tear_down(self):
+        super().tear_down()
+        if self.stream is not None:
+            self.stream.close()
+            logger.info("Stream complete: %d segments in %s", len(self.stream.segments), self.stream.directory)
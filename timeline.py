@@ -0,0 +1,322 @@
+"""Timeline tools: play coalescing, declarative timelines and incremental renders.
+
+A timeline is a JSON (or, with PyYAML installed, YAML) file listing the
+segments of a scene in order. Each segment becomes a manim section and runs
+one of the scene's timeline_steps with the given params:
+
+    {"version": 1,
+     "network": {...NetworkSpec fields, optional...},
+     "segments": [
+       {"title": "Part 1: Network & Input Setup", "at": "0:00",
+        "step": "show_network_and_inputs", "params": {"vector_label": "Input Vector x"}},
+       ...]}
+
+"at" and "events" are documentation only. Render a timeline incrementally
+with
+
+    python timeline.py manime.py ForwardPropagationDemo timelines/forward_propagation.json -q k
+
+Every segment is keyed by its definition, the network, the code and a hash
+of the on-screen state it starts from. Only segments whose key changed are
+rendered again (a segment whose starting state changed counts, so edits
+propagate downstream exactly as far as they affect the picture); the rest
+come from the segment cache and everything is joined with a stream copy.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import *
+
+from parallel_render import QUALITY_FLAGS, concat, render_section, video_dir
+from scene_base import SectionedScene, load_scene_class, module_files, scan_sections
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+def can_coalesce(animation):
+    # Transforms (including .animate) only depend on their start and target
+    # copies, so they can be replayed later from any state. Introducers and
+    # removers change scene membership and are played as they come.
+    return (
+        isinstance(animation, Transform)
+        and not animation.is_introducer()
+        and not animation.is_remover()
+    )
+
+
+class Chain(Animation):
+    """Several already-recorded plays run back to back as one animation.
+
+    Each segment is the list of (begun) animations of one play() call and its
+    run time. At any moment only the current segment is interpolated, with
+    its own rate functions. When every run time is a whole number of frames
+    (CoalescingScene only chains those), the frames match playing the
+    segments one by one while producing a single partial movie file;
+    otherwise manim would round each play separately and the counts differ.
+    """
+
+    def __init__(self, segments, **kwargs):
+        self.segments = segments
+        animations = [a for animations, _ in segments for a in animations]
+        mobjects = list(dict.fromkeys(a.mobject for a in animations))
+        super().__init__(
+            Group(*mobjects),
+            run_time=sum(run_time for _, run_time in segments),
+            rate_func=linear,
+            **kwargs
+        )
+        # Everything the chain can cover, for moving/static detection
+        self.target_mobject = Group(*[
+            m for a in animations for m in (a.starting_mobject, a.target_mobject)
+        ])
+        self.ends = np.cumsum([run_time for _, run_time in segments])
+
+    def begin(self):
+        # Put every mobject back where its first animation starts
+        for animations, _ in reversed(self.segments):
+            for animation in animations:
+                animation.interpolate(0)
+        # The sub-animations keep their own starting copies
+        self.starting_mobject = self.mobject
+        self.finished = 0
+
+    def interpolate_mobject(self, alpha):
+        t = alpha * self.run_time
+        while self.finished < len(self.segments) and t >= self.ends[self.finished]:
+            for animation in self.segments[self.finished][0]:
+                animation.interpolate(1)
+            self.finished += 1
+        if self.finished < len(self.segments):
+            animations, run_time = self.segments[self.finished]
+            start = self.ends[self.finished] - run_time
+            for animation in animations:
+                animation.interpolate((t - start) / run_time)
+
+    def finish(self):
+        self.interpolate_mobject(1)
+
+    def clean_up_from_scene(self, scene):
+        for animations, _ in self.segments:
+            for animation in animations:
+                animation.clean_up_from_scene(scene)
+
+
+class CoalescingScene(Scene):
+    """Merge consecutive play() calls into a single segment.
+
+    Inside `with self.coalesce():` every play() made of Transform-style
+    animations is applied to the mobjects right away (so the next
+    `.animate` sees the right state) and recorded instead of rendered. On
+    leaving the block, or when an animation that can't be merged comes
+    along, the recorded plays are rendered as one Chain: same frames, one
+    partial movie file, one encoder flush and one hash. Plays whose run time
+    isn't a whole number of frames are played as they come, since manim
+    rounds each play's frame count on its own.
+
+    So the number of plays depends on the frame rate: at 60 fps a 0.7 s and
+    a 0.3 s pulse become one Chain, at 15 fps they are two plays. Play
+    numbers (-n ranges, section scans, checkpoints, keyframe names) are only
+    valid for the frame rate they were counted at; the tools here scan at
+    the quality they render.
+    """
+
+    def setup(self):
+        super().setup()
+        self._recorded_plays = None
+        self.coalesced_plays = 0
+
+    @contextmanager
+    def coalesce(self):
+        self._recorded_plays = []
+        try:
+            yield
+        finally:
+            self.flush_plays()
+            self._recorded_plays = None
+
+    def play(self, *args, **kwargs):
+        if self._recorded_plays is None:
+            return super().play(*args, **kwargs)
+
+        animations = self.compile_animations(*args, **kwargs)
+        frames = max(a.run_time for a in animations) * self.renderer.camera.frame_rate
+        if abs(frames - round(frames)) > 1e-6 or not all(can_coalesce(animation) for animation in animations):
+            self.flush_plays()
+            return super().play(*animations)
+
+        for animation in animations:
+            animation.begin()
+            animation.finish()
+        self._recorded_plays.append((animations, max(a.run_time for a in animations)))
+
+    def flush_plays(self):
+        recorded = self._recorded_plays
+        if not recorded:
+            return
+        self._recorded_plays = []
+        self.coalesced_plays += len(recorded) - 1
+        super().play(Chain(recorded))
+
+
+def load_timeline(path):
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yml", ".yaml"):
+        if yaml is None:
+            raise RuntimeError("YAML timelines need PyYAML (pip install pyyaml)")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def validate_timeline(timeline, steps):
+    segments = timeline.get("segments")
+    if not isinstance(segments, list) or not segments:
+        raise ValueError("a timeline needs a non-empty list of segments")
+    for i, segment in enumerate(segments):
+        if not isinstance(segment.get("title"), str):
+            raise ValueError(f"segment {i} has no title")
+        if segment.get("step") not in steps:
+            raise ValueError(f"segment {i} ({segment['title']}): unknown step {segment.get('step')!r}, "
+                             f"choose from {', '.join(steps)}")
+        if not isinstance(segment.get("params", {}), dict):
+            raise ValueError(f"segment {i} ({segment['title']}): params must be a mapping")
+
+
+class TimelineScene(SectionedScene):
+    """Scene built from a timeline of steps, one section per segment.
+
+    The timeline comes from the MANIM_TIMELINE environment variable, the
+    timeline_file attribute or, failing both, default_timeline().
+    """
+
+    timeline_steps = ()
+    timeline_file = None
+
+    def default_timeline(self):
+        return {"version": 1, "segments": []}
+
+    def get_timeline(self):
+        path = os.environ.get("MANIM_TIMELINE") or self.timeline_file
+        timeline = load_timeline(path) if path else self.default_timeline()
+        validate_timeline(timeline, self.timeline_steps)
+        return timeline
+
+    def run_timeline(self, timeline):
+        for segment in timeline["segments"]:
+            self.section(segment["title"])
+            getattr(self, segment["step"])(**segment.get("params", {}))
+
+
+def code_hash(file):
+    # Any change to the scene or the helper modules it imports invalidates
+    # every segment; tools next to it (bench.py, daemon.py, ...) don't count
+    digest = hashlib.sha256()
+    for file in module_files(file):
+        digest.update(file.name.encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def segment_key(segment, network, state, quality, code):
+    payload = json.dumps(
+        {"segment": segment, "network": network, "state": state, "quality": quality, "code": code},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def check_section_starts(log, sections, i):
+    """Raise if a worker's render put section i (or the next one) at other plays than the scan."""
+    starts = [tuple(start) for start in json.loads(Path(log).read_text())["sections"]]
+    if not starts or starts[0][1] > 0:
+        starts.insert(0, ("Start", 0))
+    expected = [(section["name"], section["first"]) for section in sections[:i + 2]]
+    if starts[:len(expected)] != expected:
+        raise RuntimeError(
+            f"render of {sections[i]['name']!r} saw sections at plays {starts[:len(expected)]}, "
+            f"the scan at {expected}; play counts differ between the scan and the render"
+        )
+
+
+def render_incremental(file, scene, timeline_path, quality="l", jobs=None, media_dir="media"):
+    file = Path(file)
+    # The dry run here and the manim workers all read the timeline from the environment
+    os.environ["MANIM_TIMELINE"] = str(Path(timeline_path).resolve())
+    timeline = load_timeline(timeline_path)
+    scene_class = load_scene_class(file, scene)
+    sections = scan_sections(scene_class, record_states=True, quality=quality)
+    # Workers log the section starts they saw, checked against the scan
+    os.environ["MANIM_SECTION_LOG"] = "1"
+    segments = timeline["segments"]
+    if len(sections) != len(segments):
+        raise RuntimeError(f"scene produced {len(sections)} sections for {len(segments)} timeline segments")
+
+    network = timeline.get("network")
+    if network is None and hasattr(scene_class, "spec"):
+        network = scene_class.spec.to_dict()
+    code = code_hash(file)
+    cache = Path(media_dir) / "timeline_segments" / file.stem / scene / quality
+    cache.mkdir(parents=True, exist_ok=True)
+
+    todo = []
+    movies = []
+    for i, (segment, section) in enumerate(zip(segments, sections)):
+        if section["last"] < section["first"]:
+            continue
+        key = segment_key(segment, network, section["state"], quality, code)
+        movie = cache / f"{key}.mp4"
+        movies.append(movie)
+        if not movie.exists():
+            todo.append((i, segment, section, key, movie))
+
+    start = time.perf_counter()
+    out_dir = video_dir(media_dir, file.stem, quality)
+
+    def render(item):
+        i, segment, section, key, movie = item
+        output = f"{scene}_{key}"
+        # One media directory per segment position, so workers never share partials
+        workdir = Path(media_dir) / "sections" / f"{scene}_segment{i:02d}"
+        log = workdir / f"{scene}_sections.json"
+        log.unlink(missing_ok=True)
+        seconds = render_section(file, scene, quality, section["first"], section["last"], output, media_dir,
+                                 workdir=workdir)
+        check_section_starts(log, sections, i)
+        shutil.move(str(out_dir / f"{output}.mp4"), movie)
+        return seconds
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for item, seconds in zip(todo, pool.map(render, todo)):
+            print(f"rendered {item[1]['title']} in {seconds:.1f}s")
+
+    final = out_dir / f"{scene}.mp4"
+    concat(movies, final)
+    print(f"{len(todo)} of {len(movies)} segments re-rendered, {final} written "
+          f"in {time.perf_counter() - start:.1f}s")
+    return final
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a timeline, re-rendering only changed segments.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("timeline")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_FLAGS), default="l")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--media_dir", default=config.media_dir)
+    args = parser.parse_args(argv)
+    render_incremental(args.file, args.scene, args.timeline, args.quality, args.jobs, args.media_dir)
+
+
+if __name__ == "__main__":
+    main()